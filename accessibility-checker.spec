@@ -31,12 +31,20 @@ binaries.append((os.path.join(browser_dir, "**"), f"playwright/driver/package/.l
 if stealth_js_src and os.path.isdir(stealth_js_src):
     datas.append((os.path.join(stealth_js_src, "*"), stealth_js_dst))
 
-if os.path.isdir("rules"):
-    datas.append(("rules/*", "rules"))
+# Модули правил импортируются динамически по манифесту, поэтому перечисляем их явно
+sys.path.insert(0, os.getcwd())
+from rules.manifest import RULE_MANIFEST
+rule_modules = [f"rules.{spec.module}" for spec in RULE_MANIFEST]
 
 if os.path.isdir("report_maker"):
     datas.append(("report_maker/*", "report_maker"))
 
+    # Шаблон HTML-отчёта компилируется в модуль Python заранее, чтобы не разбирать его при запуске
+    from report_maker.html import compile_templates
+    compiled_dir = os.path.join("build", "report_templates")
+    compile_templates(compiled_dir)
+    datas.append((os.path.join(compiled_dir, "*.py"), "report_maker/compiled"))
+
 a = Analysis(
     ['main.py'],
     pathex=[],
@@ -49,14 +57,15 @@ a = Analysis(
         'playwright._impl._driver',
         'bs4',
         'lxml',
-        'weasyprint',
         'colorama',
+        'jinja2',
+        'aiohttp',
         'playwright_stealth',
-    ],
+    ] + rule_modules,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['tkinter'],
     noarchive=False,
     optimize=0,
 )
@@ -95,7 +104,8 @@ exe_onefile = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # Сжатые UPX библиотеки распаковываются при каждом запуске и замедляют холодный старт
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=True,
@@ -0,0 +1,111 @@
+from typing import TYPE_CHECKING, Dict, Iterable
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Route
+
+# Предустановки блокировки: тип ресурса Playwright (resource_type) для каждой категории
+RESOURCE_PRESETS = {
+    'images': frozenset({'image'}),
+    'media': frozenset({'media'}),
+    'fonts': frozenset({'font'}),
+}
+
+# Хосты (и их поддомены) сервисов аналитики, рекламы и трекинга
+TRACKER_HOSTS = frozenset({
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'adservice.google.com',
+    'connect.facebook.net',
+    'mc.yandex.ru',
+    'an.yandex.ru',
+    'yandex.ru/ads',
+    'top-fwz1.mail.ru',
+    'counter.yadro.ru',
+    'vk.com/rtrg',
+    'hotjar.com',
+    'mixpanel.com',
+    'segment.io',
+    'cdn.segment.com',
+    'amplitude.com',
+    'clarity.ms',
+    'criteo.com',
+    'criteo.net',
+    'adnxs.com',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'taboola.com',
+    'outbrain.com',
+})
+
+BLOCK_PRESETS = tuple(RESOURCE_PRESETS) + ('trackers',)
+
+
+def validate_presets(presets: Iterable[str]) -> frozenset:
+    """
+    Проверить названия предустановок блокировки
+
+    :param presets: названия предустановок
+    :return: множество предустановок
+    """
+    presets = frozenset(presets)
+    unknown = presets - set(BLOCK_PRESETS)
+    if unknown:
+        raise ValueError(f"Неизвестный тип блокировки: {', '.join(sorted(unknown))}. Доступны: {', '.join(BLOCK_PRESETS)}")
+    return presets
+
+
+def _is_tracker(url: str) -> bool:
+    """Запрос направлен к известному трекеру (сравниваются хост, его родительские домены и первый сегмент пути)"""
+    parts = urlsplit(url)
+    labels = (parts.hostname or '').lower().split('.')
+    domains = ['.'.join(labels[i:]) for i in range(len(labels) - 1)]
+    segment = parts.path.split('/', 2)[1] if parts.path.startswith('/') else ''
+    return any(domain in TRACKER_HOSTS or f"{domain}/{segment}" in TRACKER_HOSTS for domain in domains)
+
+
+class ResourceBlocker:
+    """
+    Перехват запросов страницы с блокировкой ненужных для проверки ресурсов
+
+    Правила работают с сериализованным DOM, поэтому изображения, медиа, шрифты
+    и трекеры не влияют на результат, но замедляют загрузку
+    """
+
+    def __init__(self, presets: Iterable[str]):
+        """
+        :param presets: предустановки блокировки (см. BLOCK_PRESETS)
+        """
+        presets = validate_presets(presets)
+        self.track = 'trackers' in presets
+        self.resource_types = {
+            resource_type: preset
+            for preset in presets if preset in RESOURCE_PRESETS
+            for resource_type in RESOURCE_PRESETS[preset]
+        }
+        self.blocked: Dict[str, int] = {preset: 0 for preset in sorted(presets)}
+
+    async def attach(self, page: "Page") -> None:
+        """
+        Включить перехват запросов страницы
+
+        :param page: страница Playwright
+        """
+        await page.route('**/*', self._handle)
+
+    async def _handle(self, route: "Route") -> None:
+        """Заблокировать или пропустить запрос"""
+        request = route.request
+        preset = self.resource_types.get(request.resource_type)
+        if preset is None and self.track and _is_tracker(request.url):
+            preset = 'trackers'
+
+        if preset is None:
+            await route.continue_()
+            return
+
+        self.blocked[preset] += 1
+        await route.abort('blockedbyclient')
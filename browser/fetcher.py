@@ -1,71 +1,58 @@
 import asyncio
-from typing import Dict
-from playwright.async_api import TimeoutError as PlaywrightTimeout, ViewportSize
-from playwright_stealth import Stealth
-from playwright.async_api import async_playwright
+from typing import Dict, Iterable, Optional
+from playwright.async_api import TimeoutError as PlaywrightTimeout, BrowserContext
 
+from browser.blocking import ResourceBlocker, validate_presets
 from browser.exceptions import PageFetchTimeout, PageFetchError
+from browser.load import LoadStrategy
+from browser.pool import BrowserPool
+from profiling import Profiler, profiled
+
+# Абсолютные адреса всех ссылок отрисованной страницы
+_LINKS_SCRIPT = "() => Array.from(document.links, a => a.href)"
 
 
 class PageFetcher:
-    def __init__(self, timeout: int = 30000):
+    def __init__(self, timeout: int = 30000, profiler: Optional[Profiler] = None,
+                 pool: Optional[BrowserPool] = None, collect_links: bool = False,
+                 block: Iterable[str] = (), load: Optional[LoadStrategy] = None):
         """
         :param timeout: интервал ожидания в мс
+        :param profiler: профилировщик для замеров этапов загрузки
+        :param pool: пул запущенных браузеров (без него браузер запускается на каждый вызов)
+        :param collect_links: собирать адреса ссылок страницы (ключ links в результате)
+        :param block: блокируемые ресурсы (см. browser.blocking.BLOCK_PRESETS);
+            число заблокированных запросов по категориям возвращается в ключе blocked
+        :param load: условие готовности страницы (по умолчанию networkidle);
+            стратегия и фактическое время ожидания возвращаются в ключе load
         """
         self.timeout = timeout
+        self.profiler = profiler
+        self.pool = pool
+        self.collect_links = collect_links
+        self.block = validate_presets(block)
+        self.load = load or LoadStrategy()
 
     async def fetch(self, url: str) -> Dict[str, any]:
         """
         Загружает страницу и возвращает данные
 
         :param url: адрес страницы
-        :return: словарь с ключами html, url, title, status
+        :return: словарь с ключами html, url, title, status, load, fetched_via (links при collect_links, blocked при блокировке)
         """
         try:
-            # Запуск в stealth-режиме для обхода блокировок ботов
-            stealth = Stealth()
-
-            async with stealth.use_async(async_playwright()) as p:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=[
-                        "--disable-blink-features=AutomationControlled",
-                        "--disable-dev-shm-usage",
-                        "--no-sandbox",
-                    ],
-                )
-
-                context = await browser.new_context(
-                    viewport=ViewportSize(width=1920, height=1080),
-                    user_agent=(
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/120.0.0.0 Safari/537.36"
-                    ),
-                    locale="ru-RU",
-                )
-
-                await stealth.apply_stealth_async(context)
-
-                page = await context.new_page()
-                page.set_default_timeout(self.timeout)
-
-                response = await page.goto(url, wait_until="networkidle")
-                await page.wait_for_load_state("domcontentloaded")
-
-                html_content = await page.content()
-                final_url = page.url
-                title = await page.title()
-                status = response.status if response else None
-
-                await browser.close()
-
-                return {
-                    "html": html_content,
-                    "url": final_url,
-                    "title": title,
-                    "status": status,
-                }
+            if self.pool is not None:
+                async with self.pool.context() as context:
+                    return await self._load(context, url)
+
+            pool = BrowserPool()
+            try:
+                with profiled(self.profiler, 'fetch: browser launch'):
+                    await pool.start()
+                async with pool.context() as context:
+                    return await self._load(context, url)
+            finally:
+                await pool.close()
 
         except PlaywrightTimeout:
             raise PageFetchTimeout(url, self.timeout)
@@ -73,14 +60,72 @@ class PageFetcher:
         except Exception as e:
             raise PageFetchError(url, e)
 
+    async def _load(self, context: BrowserContext, url: str) -> Dict[str, any]:
+        """
+        Открыть страницу в контексте браузера и получить её содержимое
 
-def fetch_page(url: str, timeout: int = 30) -> Dict[str, any]:
+        :param context: контекст браузера
+        :param url: адрес страницы
+        :return: словарь с ключами html, url, title, status, load, fetched_via (links при collect_links, blocked при блокировке)
+        """
+        page = await context.new_page()
+        page.set_default_timeout(self.timeout)
+
+        blocker = None
+        if self.block:
+            blocker = ResourceBlocker(self.block)
+            await blocker.attach(page)
+
+        with profiled(self.profiler, 'fetch: navigation'):
+            response, load_info = await self.load.navigate(page, url)
+
+        with profiled(self.profiler, 'fetch: content transfer'):
+            html_content = await page.content()
+            final_url = page.url
+            title = await page.title()
+            links = await page.evaluate(_LINKS_SCRIPT) if self.collect_links else None
+        status = response.status if response else None
+
+        result = {
+            "html": html_content,
+            "url": final_url,
+            "title": title,
+            "status": status,
+            "load": load_info,
+            "fetched_via": "browser",
+        }
+        if links is not None:
+            result["links"] = links
+        if blocker is not None:
+            result["blocked"] = blocker.blocked
+        return result
+
+
+def fetch_page(url: str, timeout: int = 30, profiler: Optional[Profiler] = None,
+               pool: Optional[BrowserPool] = None, block: Iterable[str] = (),
+               load: Optional[LoadStrategy] = None, mode: str = 'browser') -> Dict[str, any]:
     """
     Синхронная обёртка вокруг fetch
 
     :param url: адрес страницы
     :param timeout: интервал ожидания в секундах
-    :return: словарь с ключами html, url, title, status
+    :param profiler: профилировщик для замеров этапов загрузки
+    :param pool: пул браузеров; выполняется в его цикле событий (см. BrowserPool.run_sync)
+    :param block: блокируемые ресурсы (см. browser.blocking.BLOCK_PRESETS)
+    :param load: условие готовности страницы (по умолчанию networkidle)
+    :param mode: способ загрузки (см. browser.http_fetcher.FETCH_MODES)
+    :return: словарь с ключами html, url, title, status, fetched_via (load и blocked при загрузке в браузере)
     """
-    fetcher = PageFetcher(timeout * 1000)
-    return asyncio.run(fetcher.fetch(url))
\ No newline at end of file
+    fetcher = PageFetcher(timeout * 1000, profiler, pool, block=block, load=load)
+
+    async def fetch() -> Dict[str, any]:
+        if mode == 'browser':
+            return await fetcher.fetch(url)
+
+        from browser.http_fetcher import HttpFetcher, AutoFetcher
+        async with HttpFetcher(timeout * 1000, profiler) as http:
+            return await AutoFetcher(http, fetcher if mode == 'auto' else None).fetch(url)
+
+    if pool is not None:
+        return pool.run_sync(fetch())
+    return asyncio.run(fetch())
@@ -0,0 +1,236 @@
+import asyncio
+import html as html_module
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+from browser.exceptions import PageFetchTimeout, PageFetchError
+from browser.pool import USER_AGENT
+from profiling import Profiler, profiled
+
+if TYPE_CHECKING:
+    import aiohttp
+    from browser.fetcher import PageFetcher
+    from browser.load import LoadStrategy
+    from browser.pool import BrowserPool
+
+# Способы загрузки: только браузер, HTTP с переходом на браузер при необходимости, только HTTP
+FETCH_MODES = ('browser', 'auto', 'http')
+
+# Пустой корневой контейнер клиентского приложения (React, Vue, Next, Nuxt, Gatsby, Angular, Quasar)
+_EMPTY_ROOT = re.compile(
+    r'<(div|main|section)\b[^>]*\bid\s*=\s*["\']?(?:root|app|__next|__nuxt|___gatsby|q-app|svelte)["\'\s>]'
+    r'[^>]*>\s*</\1>'
+    r'|<(app-root)\b[^>]*>\s*</app-root>',
+    re.IGNORECASE
+)
+
+# Признаки шаблонов, которые заполняются только в браузере
+_FRAMEWORK_MARKERS = re.compile(r'\bng-app\b|\bng-controller\b|\bv-cloak\b|\bx-cloak\b', re.IGNORECASE)
+
+_BODY = re.compile(r'<body\b[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+_NON_CONTENT = re.compile(
+    r'<(script|style|template|noscript)\b[^>]*>.*?</\1\s*>|<!--.*?-->',
+    re.IGNORECASE | re.DOTALL
+)
+_NOSCRIPT = re.compile(r'<noscript\b', re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+_TITLE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+_LINK = re.compile(r'<a\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+_BASE = re.compile(r'<base\b[^>]*?\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+
+# Минимальная длина видимого текста страницы, отрисованной на сервере
+_MIN_TEXT_LENGTH = 50
+
+
+def needs_browser(html: str, content_type: Optional[str] = None) -> Optional[str]:
+    """
+    Определить, нужен ли странице браузер для отрисовки содержимого
+
+    :param html: HTML, полученный по HTTP
+    :param content_type: заголовок Content-Type ответа
+    :return: причина перехода на браузер или None, если HTML уже готов к проверке
+    """
+    if content_type and 'html' not in content_type.lower():
+        return f"ответ не является HTML ({content_type})"
+
+    if _EMPTY_ROOT.search(html):
+        return "пустой корневой контейнер приложения"
+
+    if _FRAMEWORK_MARKERS.search(html):
+        return "шаблоны клиентского фреймворка"
+
+    body = _BODY.search(html)
+    body = body.group(1) if body else html
+    text = _TAG.sub(' ', _NON_CONTENT.sub(' ', body))
+    if len(' '.join(text.split())) < _MIN_TEXT_LENGTH:
+        if _NOSCRIPT.search(body):
+            return "содержимое страницы только в <noscript>"
+        return "страница почти не содержит текста без JavaScript"
+
+    return None
+
+
+def _first_group(match: re.Match) -> str:
+    """Значение атрибута из любой из альтернатив регулярного выражения"""
+    return html_module.unescape(next(g for g in match.groups() if g is not None))
+
+
+class HttpFetcher:
+    """
+    Загрузка страниц по HTTP без браузера через общую сессию aiohttp
+
+    Сессия и пул соединений создаются при первой загрузке и переиспользуются
+    до вызова close()
+    """
+
+    def __init__(self, timeout: int = 30000, profiler: Optional[Profiler] = None,
+                 collect_links: bool = False, limit: int = 100, limit_per_host: int = 8):
+        """
+        :param timeout: интервал ожидания в мс
+        :param profiler: профилировщик для замеров этапов загрузки
+        :param collect_links: собирать адреса ссылок страницы (ключ links в результате)
+        :param limit: максимальное число открытых соединений
+        :param limit_per_host: максимальное число соединений с одним хостом
+        """
+        self.timeout = timeout
+        self.profiler = profiler
+        self.collect_links = collect_links
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def close(self) -> None:
+        """
+        Закрыть сессию и соединения
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "HttpFetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def fetch(self, url: str) -> Dict[str, any]:
+        """
+        Загружает страницу по HTTP и возвращает данные
+
+        :param url: адрес страницы
+        :return: словарь с ключами html, url, title, status, content_type, fetched_via (и links при collect_links)
+        """
+        try:
+            with profiled(self.profiler, 'fetch: http'):
+                async with self._get_session().get(url) as response:
+                    html = await response.text(errors='replace')
+                    final_url = str(response.url)
+                    status = response.status
+                    content_type = response.headers.get('Content-Type')
+
+        except asyncio.TimeoutError:
+            raise PageFetchTimeout(url, self.timeout)
+
+        except Exception as e:
+            raise PageFetchError(url, e)
+
+        title = _TITLE.search(html)
+        result = {
+            "html": html,
+            "url": final_url,
+            "title": ' '.join(html_module.unescape(title.group(1)).split()) if title else '',
+            "status": status,
+            "content_type": content_type,
+            "fetched_via": "http",
+        }
+        if self.collect_links:
+            # Относительные адреса разрешаются относительно <base href> или адреса страницы
+            base = _BASE.search(html)
+            result["base"] = _first_group(base) if base else None
+            result["links"] = [_first_group(match) for match in _LINK.finditer(html)]
+        return result
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Сессия aiohttp (создаётся в текущем цикле событий при первом обращении)"""
+        if self._session is None:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                               ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout / 1000),
+                headers={'User-Agent': USER_AGENT, 'Accept-Language': 'ru-RU,ru;q=0.9'},
+            )
+        return self._session
+
+
+class AutoFetcher:
+    """
+    Загрузка по HTTP с переходом на браузер для страниц, которым нужен JavaScript
+
+    Без браузерного загрузчика (режим http) страницы всегда берутся из HTTP-ответа
+    """
+
+    def __init__(self, http: HttpFetcher, browser: Optional["PageFetcher"] = None):
+        """
+        :param http: загрузчик по HTTP
+        :param browser: браузерный загрузчик для перехода (None - не переходить)
+        """
+        self.http = http
+        self.browser = browser
+
+    async def fetch(self, url: str) -> Dict[str, any]:
+        """
+        Загружает страницу по HTTP, а при необходимости - в браузере
+
+        :param url: адрес страницы
+        :return: данные страницы; fetched_via - способ загрузки (http или browser),
+            fallback_reason - причина перехода на браузер
+        """
+        try:
+            page_data = await self.http.fetch(url)
+            reason = needs_browser(page_data['html'], page_data['content_type'])
+            if reason is None and page_data['status'] >= 400:
+                reason = f"HTTP {page_data['status']}"
+        except PageFetchTimeout as e:
+            if self.browser is None:
+                raise
+            page_data, reason = None, f"таймаут HTTP-загрузки ({e.timeout} мс)"
+        except PageFetchError as e:
+            if self.browser is None:
+                raise
+            page_data, reason = None, f"ошибка HTTP-загрузки: {e.original_exception}"
+
+        if reason is None or self.browser is None:
+            return page_data
+
+        page_data = await self.browser.fetch(url)
+        page_data['fallback_reason'] = reason
+        return page_data
+
+
+def make_fetcher(mode: str = 'browser', timeout: int = 30000, pool: Optional["BrowserPool"] = None,
+                 collect_links: bool = False, block: Iterable[str] = (),
+                 load: Optional["LoadStrategy"] = None) -> Tuple[object, Optional[HttpFetcher]]:
+    """
+    Создать загрузчик страниц для способа загрузки
+
+    :param mode: способ загрузки (см. FETCH_MODES)
+    :param timeout: интервал ожидания в мс
+    :param pool: пул браузеров
+    :param collect_links: собирать адреса ссылок страницы
+    :param block: блокируемые в браузере ресурсы
+    :param load: условие готовности страницы в браузере
+    :return: загрузчик (с методом fetch) и HTTP-загрузчик, который нужно закрыть после работы (или None)
+    """
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Неизвестный способ загрузки: {mode}. Доступны: {', '.join(FETCH_MODES)}")
+
+    from browser.fetcher import PageFetcher
+
+    fetcher = PageFetcher(timeout, pool=pool, collect_links=collect_links, block=block, load=load)
+    if mode == 'browser':
+        return fetcher, None
+
+    http = HttpFetcher(timeout, collect_links=collect_links)
+    return AutoFetcher(http, fetcher if mode == 'auto' else None), http
@@ -0,0 +1,85 @@
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Response
+
+# Стратегии ожидания готовности страницы
+LOAD_STRATEGIES = ('domcontentloaded', 'load', 'networkidle', 'selector', 'settled')
+
+# Ожидание паузы в изменениях DOM: true - DOM не менялся quiet мс, false - истёк предельный срок cap мс
+_SETTLE_SCRIPT = """([quiet, cap]) => new Promise(resolve => {
+    let timer;
+    const finish = settled => {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(deadline);
+        resolve(settled);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(() => finish(true), quiet);
+    });
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    timer = setTimeout(() => finish(true), quiet);
+    const deadline = setTimeout(() => finish(false), cap);
+})"""
+
+
+@dataclass(frozen=True)
+class LoadStrategy:
+    """
+    Условие, при котором страница считается загруженной
+
+    domcontentloaded, load и networkidle - события навигации Playwright;
+    selector - появление элемента по CSS-селектору после domcontentloaded;
+    settled - отсутствие изменений DOM в течение quiet_ms после domcontentloaded,
+    но не дольше cap_ms
+    """
+    name: str = 'networkidle'
+    selector: Optional[str] = None  # CSS-селектор для стратегии selector
+    quiet_ms: int = 500  # Длительность паузы в изменениях DOM для стратегии settled
+    cap_ms: int = 10000  # Предельное время ожидания паузы для стратегии settled
+
+    def __post_init__(self):
+        if self.name not in LOAD_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия загрузки: {self.name}. Доступны: {', '.join(LOAD_STRATEGIES)}")
+        if self.name == 'selector' and not self.selector:
+            raise ValueError("Для стратегии selector нужен CSS-селектор")
+        if self.quiet_ms <= 0 or self.cap_ms <= 0:
+            raise ValueError("Время ожидания паузы в изменениях DOM должно быть положительным")
+
+    async def navigate(self, page: "Page", url: str) -> Tuple[Optional["Response"], dict]:
+        """
+        Перейти на страницу и дождаться её готовности
+
+        :param page: страница Playwright
+        :param url: адрес страницы
+        :return: ответ навигации и сведения об ожидании (strategy, waited_ms и settled для settled)
+        """
+        from playwright.async_api import Error as PlaywrightError
+
+        started = time.perf_counter()
+        info = {'strategy': self.name}
+
+        if self.name in ('domcontentloaded', 'load'):
+            response = await page.goto(url, wait_until=self.name)
+        elif self.name == 'networkidle':
+            response = await page.goto(url, wait_until="networkidle")
+            await page.wait_for_load_state("domcontentloaded")
+        else:
+            response = await page.goto(url, wait_until="domcontentloaded")
+            if self.name == 'selector':
+                info['selector'] = self.selector
+                await page.wait_for_selector(self.selector, state='attached')
+            else:
+                try:
+                    info['settled'] = await page.evaluate(_SETTLE_SCRIPT, [self.quiet_ms, self.cap_ms])
+                except PlaywrightError:
+                    # Страница перешла по другому адресу во время ожидания
+                    await page.wait_for_load_state("domcontentloaded")
+                    info['settled'] = False
+
+        info['waited_ms'] = round((time.perf_counter() - started) * 1000)
+        return response, info
@@ -0,0 +1,235 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Объём JS-кучи страницы (Chromium); память процессов браузера этим значением не учитывается
+_HEAP_SCRIPT = "() => (performance.memory && performance.memory.usedJSHeapSize) || 0"
+
+
+@dataclass
+class _BrowserSlot:
+    """
+    Запущенный браузер пула и его счётчики
+    """
+    browser: "Browser"
+    pages: int = 0  # Сколько контекстов выдано
+    active: int = 0  # Сколько контекстов открыто сейчас
+    page_heap: int = 0  # Наибольший объём JS-кучи одной страницы этого браузера, байт
+    retiring: bool = False  # Браузер будет закрыт после закрытия всех контекстов
+
+
+class BrowserPool:
+    """
+    Пул запущенных экземпляров Chromium
+
+    Браузеры запускаются один раз и переиспользуются; каждая страница получает
+    новый изолированный контекст. Браузер перезапускается после заданного числа
+    страниц или после страницы, JS-куча которой превысила порог (это защищает от
+    тяжёлых страниц, но не ограничивает общую память процессов браузера).
+    Playwright импортируется только при запуске пула
+    """
+
+    def __init__(self, size: int = 1, max_pages_per_browser: int = 100,
+                 max_page_heap_mb: Optional[int] = None):
+        """
+        :param size: число одновременно запущенных браузеров
+        :param max_pages_per_browser: число страниц, после которого браузер перезапускается
+        :param max_page_heap_mb: порог JS-кучи одной страницы в МБ (performance.memory.usedJSHeapSize);
+            браузер, на котором его превысила хотя бы одна страница, перезапускается
+        """
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_page_heap_mb = max_page_heap_mb
+
+        self._stealth = None
+        self._playwright_cm = None
+        self._playwright = None
+        self._slots: List[_BrowserSlot] = []
+        self._lock = asyncio.Lock()
+        self._start_lock = asyncio.Lock()
+        self._runner: Optional[asyncio.Runner] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        """
+        Запустить Playwright и все браузеры пула
+        """
+        if self._closed:
+            raise RuntimeError("Пул браузеров закрыт")
+
+        async with self._start_lock:
+            if self._playwright is not None:
+                return
+
+            from playwright.async_api import async_playwright
+            from playwright_stealth import Stealth
+
+            # Запуск в stealth-режиме для обхода блокировок ботов
+            self._stealth = Stealth()
+            self._playwright_cm = self._stealth.use_async(async_playwright())
+            self._playwright = await self._playwright_cm.__aenter__()
+
+        async with self._lock:
+            while len(self._slots) < self.size:
+                self._slots.append(_BrowserSlot(await self._launch()))
+
+    async def close(self) -> None:
+        """
+        Закрыть все браузеры и остановить Playwright
+        """
+        self._closed = True
+        slots, self._slots = self._slots, []
+        for slot in slots:
+            await self._close_browser(slot)
+
+        if self._playwright_cm is not None:
+            await self._playwright_cm.__aexit__(None, None, None)
+            self._playwright_cm = None
+            self._playwright = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator["BrowserContext"]:
+        """
+        Выдать новый изолированный контекст браузера на время работы со страницей
+
+        Контекст закрывается при выходе; браузер, исчерпавший лимит страниц или
+        JS-кучи страницы, перезапускается после закрытия всех его контекстов.
+        Браузер, в котором не удалось создать контекст, заменяется новым
+        """
+        await self.start()
+        slot = await self._acquire()
+        context = None
+        try:
+            try:
+                context = await slot.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent=USER_AGENT,
+                    locale="ru-RU",
+                )
+                await self._stealth.apply_stealth_async(context)
+            except Exception:
+                # Скорее всего, процесс браузера завершился: следующие страницы получат новый
+                slot.retiring = True
+                raise
+            yield context
+        finally:
+            if context is not None:
+                await self._measure_page_heap(slot, context)
+                await context.close()
+            await self._release(slot)
+
+    def run_sync(self, coro):
+        """
+        Выполнить корутину в собственном цикле событий пула (для синхронного кода)
+
+        Цикл сохраняется между вызовами, поэтому браузеры остаются запущенными.
+        Пул, используемый так, закрывается через close_sync()
+
+        :param coro: корутина
+        :return: результат корутины
+        """
+        if self._runner is None:
+            self._runner = asyncio.Runner()
+        return self._runner.run(coro)
+
+    def close_sync(self) -> None:
+        """
+        Закрыть пул, использовавшийся через run_sync()
+        """
+        if self._runner is None:
+            return
+        try:
+            self._runner.run(self.close())
+        finally:
+            self._runner.close()
+            self._runner = None
+
+    async def _launch(self) -> "Browser":
+        """Запустить новый экземпляр Chromium"""
+        return await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+    async def _acquire(self) -> _BrowserSlot:
+        """
+        Выбрать наименее загруженный браузер (запустив новый, если нужно)
+
+        Отключившиеся браузеры (например, после падения Chromium) выводятся из пула
+        """
+        dead: List[_BrowserSlot] = []
+        try:
+            async with self._lock:
+                for slot in self._slots:
+                    if not slot.retiring and not slot.browser.is_connected():
+                        slot.retiring = True
+                dead = [s for s in self._slots if s.retiring and s.active == 0]
+                for slot in dead:
+                    self._slots.remove(slot)
+
+                slots = [s for s in self._slots if not s.retiring]
+                if len(slots) < self.size:
+                    slot = _BrowserSlot(await self._launch())
+                    self._slots.append(slot)
+                else:
+                    slot = min(slots, key=lambda s: s.active)
+                slot.active += 1
+                slot.pages += 1
+                if slot.pages >= self.max_pages_per_browser:
+                    slot.retiring = True
+                return slot
+        finally:
+            for dead_slot in dead:
+                await self._close_browser(dead_slot)
+
+    async def _release(self, slot: _BrowserSlot) -> None:
+        """Вернуть браузер в пул и перезапустить его при исчерпании лимитов"""
+        async with self._lock:
+            slot.active -= 1
+            if self.max_page_heap_mb is not None and slot.page_heap > self.max_page_heap_mb * 1024 * 1024:
+                slot.retiring = True
+
+            if not (slot.retiring and slot.active == 0):
+                return
+            if slot in self._slots:
+                self._slots.remove(slot)
+
+        await self._close_browser(slot)
+
+    async def _measure_page_heap(self, slot: _BrowserSlot, context: "BrowserContext") -> None:
+        """Учесть объём JS-кучи открытых страниц контекста"""
+        if self.max_page_heap_mb is None:
+            return
+        for page in context.pages:
+            try:
+                slot.page_heap = max(slot.page_heap, await page.evaluate(_HEAP_SCRIPT))
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _close_browser(slot: _BrowserSlot) -> None:
+        """Закрыть браузер, игнорируя ошибки уже завершившегося процесса"""
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
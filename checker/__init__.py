@@ -0,0 +1,33 @@
+from .api import CheckResult, check_html, check_url, check_many
+from .batch import read_urls, run_batch, write_summary
+from .crawl import normalize_url, run_crawl
+from .local import collect_files, read_file, read_stream, run_local
+from .snapshots import SnapshotStore, load_snapshot
+
+__all__ = [
+    'CheckResult',
+    'check_html',
+    'check_url',
+    'check_many',
+    'read_urls',
+    'run_batch',
+    'write_summary',
+    'normalize_url',
+    'run_crawl',
+    'collect_files',
+    'read_file',
+    'read_stream',
+    'run_local',
+    'SnapshotStore',
+    'load_snapshot',
+    'CheckService',
+    'run_server'
+]
+
+
+def __getattr__(name: str):
+    # Сервис импортируется при первом обращении, чтобы не загружать aiohttp.web без --serve
+    if name in ('CheckService', 'run_server'):
+        from . import server
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
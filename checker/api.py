@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field, asdict
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from browser.load import LoadStrategy
+from browser.pool import BrowserPool
+from profiling import Profiler
+from rules import WCAGRule, Issue, RuleError
+
+# Сведения о загрузке, которые переносятся из результата загрузчика в CheckResult.fetch
+_FETCH_KEYS = ('fetched_via', 'fallback_reason', 'load', 'blocked')
+
+
+@dataclass
+class CheckResult:
+    """
+    Результат проверки страницы
+    """
+    url: str  # Запрошенный адрес (для HTML - переданный адрес, возможно пустой)
+    final_url: Optional[str] = None  # Адрес после перенаправлений
+    title: Optional[str] = None  # Заголовок страницы
+    status: Optional[int] = None  # HTTP-статус ответа
+    issues: List[Issue] = field(default_factory=list)  # Найденные нарушения
+    rule_errors: List[RuleError] = field(default_factory=list)  # Правила, завершившиеся с ошибкой
+    fetch: dict = field(default_factory=dict)  # Сведения о загрузке (fetched_via, fallback_reason, load, blocked)
+    timings: Dict[str, float] = field(default_factory=dict)  # Время этапов в мс (fetch, check)
+    error: Optional[str] = None  # Ошибка загрузки (только в check_many)
+
+    def to_dict(self) -> dict:
+        """
+        Результат в виде словаря для сериализации в JSON
+        """
+        return asdict(self)
+
+
+def check_html(html: str, url: str = '', rules: Optional[List[type]] = None,
+               parser: str = 'html.parser', cache=None, workers: Optional[int] = None,
+               profiler: Optional[Profiler] = None) -> CheckResult:
+    """
+    Проверить HTML страницы
+
+    Выполняется в вызывающем потоке; в асинхронном коде используйте
+    asyncio.to_thread или check_url
+
+    :param html: HTML-контент страницы
+    :param url: адрес страницы для результата
+    :param rules: классы правил (по умолчанию все, см. WCAGRule.select_rules)
+    :param parser: парсер HTML (см. rules.PARSERS)
+    :param cache: кэш результатов (rules.cache.ResultCache)
+    :param workers: число процессов для параллельной проверки правил
+    :param profiler: профилировщик для замеров разбора и правил
+    :return: результат проверки; ошибки правил - в rule_errors
+    """
+    result = CheckResult(url=url, final_url=url)
+    started = time.perf_counter()
+    result.issues = WCAGRule.run_all(html, parser=parser, profiler=profiler, rules=rules,
+                                     workers=workers, cache=cache, errors=result.rule_errors)
+    result.timings['check'] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def check_url(url: str, fetcher=None, pool: Optional[BrowserPool] = None,
+                    fetch_mode: str = 'browser', timeout: int = 30, block: Iterable[str] = (),
+                    load: Optional[LoadStrategy] = None, rules: Optional[List[type]] = None,
+                    parser: str = 'html.parser', cache=None, workers: Optional[int] = None) -> CheckResult:
+    """
+    Загрузить и проверить страницу
+
+    Проверка выполняется в отдельном потоке и не блокирует цикл событий
+
+    :param url: адрес страницы
+    :param fetcher: загрузчик с методом async fetch(url) (например, browser.fetcher.PageFetcher);
+        без него загрузчик создаётся по fetch_mode, pool, timeout, block и load
+    :param pool: пул браузеров (без него браузер запускается на время загрузки)
+    :param fetch_mode: способ загрузки (см. browser.http_fetcher.FETCH_MODES)
+    :param timeout: таймаут загрузки в секундах
+    :param block: блокируемые при загрузке ресурсы (см. browser.blocking.BLOCK_PRESETS)
+    :param load: условие готовности страницы
+    :param rules: классы правил (по умолчанию все)
+    :param parser: парсер HTML
+    :param cache: кэш результатов
+    :param workers: число процессов для параллельной проверки правил
+    :return: результат проверки
+    :raises PageFetchError, PageFetchTimeout: при ошибке загрузки
+    """
+    http = None
+    if fetcher is None:
+        from browser.http_fetcher import make_fetcher
+        fetcher, http = make_fetcher(fetch_mode, timeout * 1000, pool, block=block, load=load)
+
+    try:
+        started = time.perf_counter()
+        page_data = await fetcher.fetch(url)
+        fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+    finally:
+        if http is not None:
+            await http.close()
+
+    result = await asyncio.to_thread(check_html, page_data['html'], page_data['url'], rules=rules,
+                                     parser=parser, cache=cache, workers=workers)
+    result.url = url
+    result.title = page_data.get('title')
+    result.status = page_data.get('status')
+    result.fetch = {key: page_data[key] for key in _FETCH_KEYS if key in page_data}
+    result.timings = {'fetch': fetch_ms, **result.timings}
+    return result
+
+
+async def check_many(urls: Iterable[str], concurrency: int = 4, fetcher=None,
+                     pool: Optional[BrowserPool] = None, fetch_mode: str = 'browser',
+                     timeout: int = 30, block: Iterable[str] = (), load: Optional[LoadStrategy] = None,
+                     rules: Optional[List[type]] = None, parser: str = 'html.parser',
+                     cache=None) -> AsyncIterator[CheckResult]:
+    """
+    Проверить несколько страниц конкурентно
+
+    Результаты выдаются по мере готовности; ошибка загрузки страницы не прерывает
+    проверку остальных и возвращается в CheckResult.error. Если не передан ни
+    загрузчик, ни пул, пул браузеров создаётся на время проверки
+
+    :param urls: адреса страниц
+    :param concurrency: число одновременно загружаемых страниц
+    :param fetcher: загрузчик с методом async fetch(url)
+    :param pool: пул браузеров
+    :param fetch_mode: способ загрузки (см. browser.http_fetcher.FETCH_MODES)
+    :param timeout: таймаут загрузки в секундах
+    :param block: блокируемые при загрузке ресурсы
+    :param load: условие готовности страницы
+    :param rules: классы правил (по умолчанию все)
+    :param parser: парсер HTML
+    :param cache: кэш результатов
+    :return: асинхронный генератор результатов
+    """
+    if rules is None:
+        rules = WCAGRule.get_all_rules()
+
+    own_pool = None
+    http = None
+    if fetcher is None:
+        from browser.http_fetcher import make_fetcher
+        if pool is None:
+            pool = own_pool = BrowserPool(size=max(1, math.ceil(concurrency / 8)))
+        fetcher, http = make_fetcher(fetch_mode, timeout * 1000, pool, block=block, load=load)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(url: str) -> CheckResult:
+        try:
+            async with semaphore:
+                return await check_url(url, fetcher, rules=rules, parser=parser, cache=cache)
+        except Exception as e:
+            return CheckResult(url=url, error=str(e))
+
+    tasks = [asyncio.ensure_future(check(url)) for url in urls]
+    try:
+        for future in asyncio.as_completed(tasks):
+            yield await future
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if http is not None:
+            await http.close()
+        if own_pool is not None:
+            await own_pool.close()
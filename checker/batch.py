@@ -0,0 +1,150 @@
+import asyncio
+import json
+import math
+import os
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional, TextIO, Union
+
+from browser.load import LoadStrategy
+from browser.pool import BrowserPool
+from report_maker import open_issue_stream
+from .pipeline import CheckPipeline
+from .snapshots import SnapshotStore
+
+
+def read_urls(source: TextIO) -> List[str]:
+    """
+    Прочитать список URL (по одному в строке; пустые строки и строки с # пропускаются)
+
+    :param source: открытый файл или sys.stdin
+    :return: список URL без повторов (в исходном порядке)
+    """
+    urls = []
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            urls.append(line)
+    return list(dict.fromkeys(urls))
+
+
+async def run_batch(urls: Iterable[str], output_dir: str, report_type: Union[str, Iterable[str]] = 'json',
+                    timeout: int = 30, concurrency: int = 4, block: Iterable[str] = (),
+                    load: Optional[LoadStrategy] = None, fetch_mode: str = 'browser',
+                    snapshots: Optional[SnapshotStore] = None,
+                    validate: Optional[Callable[[str], bool]] = None,
+                    on_result: Optional[Callable[[dict], None]] = None,
+                    workers: Optional[int] = None, queue_size: Optional[int] = None,
+                    stats: Optional[dict] = None, stream: Optional[str] = None,
+                    compress: bool = False, **check_options) -> List[dict]:
+    """
+    Проверить несколько страниц конкурентно через общий пул браузеров
+
+    Страницы загружаются конкурентно и передаются на проверку в пул процессов
+    (см. CheckPipeline); для каждой страницы сохраняется отдельный отчёт, ошибка
+    на одной странице не прерывает проверку остальных. По завершении в каталог
+    пишется summary.json
+
+    :param urls: адреса страниц
+    :param output_dir: каталог для отчётов
+    :param report_type: формат отчётов ('json', 'html' или список форматов)
+    :param timeout: таймаут загрузки страницы в секундах
+    :param concurrency: число одновременно загружаемых страниц
+    :param block: блокируемые при загрузке ресурсы (см. browser.blocking.BLOCK_PRESETS)
+    :param load: условие готовности страницы (по умолчанию networkidle)
+    :param fetch_mode: способ загрузки (см. browser.http_fetcher.FETCH_MODES)
+    :param snapshots: хранилище, в которое сохраняются снимки загруженных страниц
+    :param validate: проверка корректности URL (некорректные попадают в сводку как ошибки)
+    :param on_result: вызывается с записью сводки после обработки каждой страницы
+    :param workers: число процессов для проверки (по умолчанию - по числу ядер)
+    :param queue_size: число загруженных страниц, ожидающих проверки
+    :param stats: словарь, в который записывается статистика этапов конвейера
+    :param stream: формат файла issues.<формат>, в который нарушения всех страниц
+        дописываются по мере проверки (см. report_maker.STREAM_FORMATS)
+    :param compress: сжимать файлы отчётов gzip
+    :param check_options: параметры WCAGRule.run_all (parser, rules, cache)
+    :return: записи сводки по каждой странице
+    """
+    # Playwright и aiohttp импортируются только при загрузке страниц
+    from browser.http_fetcher import make_fetcher
+
+    urls = list(urls)
+    os.makedirs(output_dir, exist_ok=True)
+    summary: List[dict] = [new_entry(url) for url in urls]
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, url in enumerate(urls):
+        queue.put_nowait(index)
+
+    pool = BrowserPool(size=max(1, math.ceil(concurrency / 8)))
+    fetcher, http = make_fetcher(fetch_mode, timeout * 1000, pool, block=block, load=load)
+    issue_stream = open_issue_stream(output_dir, stream) if stream else None
+    pipeline = CheckPipeline(output_dir, report_type, check_options, workers=workers, queue_size=queue_size,
+                             snapshots=snapshots, stream=issue_stream, compress=compress, on_result=on_result)
+    try:
+        async with pipeline:
+
+            async def fetch_worker() -> None:
+                while not queue.empty():
+                    index = queue.get_nowait()
+                    pipeline.stats['fetch'].sample(queue.qsize())
+                    entry = summary[index]
+                    try:
+                        if validate is not None and not validate(entry['url']):
+                            raise ValueError("Некорректный URL")
+                        with pipeline.stats['fetch'].measure():
+                            page_data = await fetcher.fetch(entry['url'])
+                    except Exception as e:
+                        entry['error'] = str(e)
+                        await pipeline.skip(entry)
+                        continue
+
+                    await pipeline.submit(page_data, entry, f"report_{index + 1:05d}")
+
+            await asyncio.gather(*(fetch_worker() for _ in range(min(concurrency, len(urls)))))
+    finally:
+        if http is not None:
+            await http.close()
+        await pool.close()
+        if snapshots is not None:
+            snapshots.flush()
+        if issue_stream is not None:
+            issue_stream.close()
+
+    if stats is not None:
+        stats.update(pipeline.stats_dict())
+    write_summary(summary, output_dir, pipeline.stats_dict())
+    return summary
+
+
+def new_entry(url: str) -> dict:
+    """
+    Пустая запись сводки для страницы
+
+    :param url: запрошенный адрес
+    """
+    return {'url': url, 'final_url': None, 'title': None, 'status': None, 'load': None,
+            'issues': None, 'report': None, 'error': None}
+
+
+def write_summary(summary: List[dict], output_dir: str, stats: Optional[dict] = None) -> str:
+    """
+    Сохранить сводку пакетной проверки в summary.json
+
+    :param summary: записи сводки по страницам
+    :param output_dir: каталог для сохранения
+    :param stats: статистика этапов конвейера (см. CheckPipeline.stats_dict)
+    :return: путь к файлу сводки
+    """
+    path = os.path.join(output_dir, 'summary.json')
+    data = {
+        'timestamp': datetime.now().isoformat(),
+        'total_pages': len(summary),
+        'failed_pages': sum(1 for e in summary if e['error']),
+        'skipped_pages': sum(1 for e in summary if e.get('skipped')),
+        'total_issues': sum(e['issues'] or 0 for e in summary),
+        'pages': summary
+    }
+    if stats is not None:
+        data['pipeline'] = stats
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
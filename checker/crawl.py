@@ -0,0 +1,240 @@
+import asyncio
+import math
+import os
+from typing import Callable, Iterable, List, Optional, Union
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+from browser.load import LoadStrategy
+from browser.pool import BrowserPool
+from report_maker import open_issue_stream
+from .batch import new_entry, write_summary
+from .pipeline import CheckPipeline
+from .snapshots import SnapshotStore
+
+# Параметры запроса, не влияющие на содержимое страницы
+TRACKING_PARAMS = frozenset({'gclid', 'fbclid', 'yclid', 'msclkid', 'dclid', 'mc_cid', 'mc_eid', '_openstat'})
+TRACKING_PREFIXES = ('utm_',)
+
+# Расширения ссылок на файлы, которые не являются HTML-страницами
+SKIPPED_EXTENSIONS = frozenset({
+    '.pdf', '.zip', '.rar', '.7z', '.gz', '.tar', '.exe', '.msi', '.dmg',
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.bmp',
+    '.mp3', '.mp4', '.avi', '.mov', '.webm', '.ogg', '.wav',
+    '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.csv', '.xml', '.json',
+    '.css', '.js',
+})
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Привести адрес к каноническому виду для дедупликации
+
+    Удаляются фрагмент, трекинговые параметры и порт по умолчанию, схема и хост
+    приводятся к нижнему регистру
+
+    :param url: адрес (возможно, относительный)
+    :param base: адрес страницы, относительно которой разрешается url
+    :return: нормализованный адрес или None для не-http(s) ссылок
+    """
+    try:
+        if base is not None:
+            url = urljoin(base, url)
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return None
+
+    netloc = parts.hostname.lower()
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ])
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+def _origin(url: str) -> str:
+    """Схема и хост адреса"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _is_page_link(url: str) -> bool:
+    """Ссылка ведёт на страницу, а не на файл"""
+    return os.path.splitext(urlsplit(url).path)[1].lower() not in SKIPPED_EXTENSIONS
+
+
+async def run_crawl(start_url: str, output_dir: str, report_type: Union[str, Iterable[str]] = 'json',
+                    timeout: int = 30, concurrency: int = 4,
+                    max_depth: int = 2, max_pages: int = 100, block: Iterable[str] = (),
+                    load: Optional[LoadStrategy] = None, fetch_mode: str = 'browser',
+                    snapshots: Optional[SnapshotStore] = None,
+                    on_result: Optional[Callable[[dict], None]] = None,
+                    workers: Optional[int] = None, queue_size: Optional[int] = None,
+                    stats: Optional[dict] = None, stream: Optional[str] = None,
+                    compress: bool = False, **check_options) -> List[dict]:
+    """
+    Обойти и проверить страницы сайта в пределах одного источника (схема и хост)
+
+    Обход и проверка выполняются за один проход: ссылки каждой загруженной страницы
+    добавляются в очередь, а сама страница передаётся на проверку в пул процессов
+    (см. CheckPipeline). Адреса нормализуются
+    (см. normalize_url); страница, на которую привело перенаправление, повторно не
+    проверяется и попадает в сводку как пропущенная (skipped)
+
+    :param start_url: начальная страница
+    :param output_dir: каталог для отчётов
+    :param report_type: формат отчётов ('json', 'html' или список форматов)
+    :param timeout: таймаут загрузки страницы в секундах
+    :param concurrency: число одновременно обрабатываемых страниц
+    :param max_depth: максимальная глубина ссылок от начальной страницы
+    :param max_pages: максимальное число проверяемых страниц (неудачные загрузки и
+        перенаправления на уже проверенные страницы не учитываются)
+    :param block: блокируемые при загрузке ресурсы (см. browser.blocking.BLOCK_PRESETS)
+    :param load: условие готовности страницы (по умолчанию networkidle)
+    :param fetch_mode: способ загрузки (см. browser.http_fetcher.FETCH_MODES)
+    :param snapshots: хранилище, в которое сохраняются снимки загруженных страниц
+    :param on_result: вызывается с записью сводки после обработки каждой страницы
+    :param workers: число процессов для проверки (по умолчанию - по числу ядер)
+    :param queue_size: число загруженных страниц, ожидающих проверки
+    :param stats: словарь, в который записывается статистика этапов конвейера
+    :param stream: формат файла issues.<формат>, в который нарушения всех страниц
+        дописываются по мере проверки (см. report_maker.STREAM_FORMATS)
+    :param compress: сжимать файлы отчётов gzip
+    :param check_options: параметры WCAGRule.run_all (parser, rules, cache)
+    :return: записи сводки по каждой странице (в порядке обработки)
+    """
+    from browser.http_fetcher import make_fetcher
+
+    start_url = normalize_url(start_url)
+    if start_url is None:
+        raise ValueError("Некорректный начальный URL")
+
+    os.makedirs(output_dir, exist_ok=True)
+    origins = {_origin(start_url)}
+    seen = {start_url}  # Адреса, поставленные в очередь
+    checked = set()  # Итоговые адреса (после перенаправлений) проверенных страниц
+    fetching = 0  # Страницы, которые загружаются сейчас и могут занять место в лимите
+    slots = asyncio.Condition()
+    summary: List[dict] = []
+
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait((start_url, 0))
+
+    pool = BrowserPool(size=max(1, math.ceil(concurrency / 8)))
+    fetcher, http = make_fetcher(fetch_mode, timeout * 1000, pool, collect_links=True, block=block, load=load)
+
+    def emit(entry: dict) -> None:
+        summary.append(entry)
+        if on_result is not None:
+            on_result(entry)
+
+    issue_stream = open_issue_stream(output_dir, stream) if stream else None
+    pipeline = CheckPipeline(output_dir, report_type, check_options, workers=workers, queue_size=queue_size,
+                             snapshots=snapshots, stream=issue_stream, compress=compress, on_result=emit)
+
+    def enqueue(links: List[str], base: str, depth: int) -> None:
+        for link in links:
+            if len(checked) >= max_pages:
+                return
+            url = normalize_url(link, base)
+            if url is None or url in seen or _origin(url) not in origins or not _is_page_link(url):
+                continue
+            seen.add(url)
+            queue.put_nowait((url, depth))
+
+    async def claim(url: str) -> bool:
+        # Загрузка начинается, только если страница может уложиться в лимит; пока другие
+        # загрузки не завершились, неизвестно, освободят ли они место. Адрес, уже
+        # проверенный как итог перенаправления с другой страницы, не загружается
+        nonlocal fetching
+        async with slots:
+            await slots.wait_for(lambda: url in checked or len(checked) + fetching < max_pages or not fetching)
+            if url in checked or len(checked) + fetching >= max_pages:
+                return False
+            fetching += 1
+            return True
+
+    async def release() -> None:
+        nonlocal fetching
+        async with slots:
+            fetching -= 1
+            slots.notify_all()
+
+    async def process(url: str, depth: int) -> None:
+        entry = new_entry(url)
+        entry['depth'] = depth
+        if not await claim(url):
+            if url in checked:
+                entry['final_url'] = url
+                entry['skipped'] = "страница уже проверена: на неё вело перенаправление с другого адреса"
+                await pipeline.skip(entry)
+            return
+
+        try:
+            with pipeline.stats['fetch'].measure():
+                page_data = await fetcher.fetch(url)
+
+            final_url = normalize_url(page_data['url']) or url
+            if final_url in checked:
+                entry['final_url'] = page_data['url']
+                entry['skipped'] = f"перенаправление на уже проверенную страницу {final_url}"
+                await pipeline.skip(entry)
+                return
+            checked.add(final_url)
+            seen.add(final_url)
+            if depth == 0:
+                # Перенаправление начальной страницы (например, http -> https) задаёт источник сайта
+                origins.add(_origin(final_url))
+
+            if depth < max_depth:
+                base = urljoin(page_data['url'], page_data.get('base') or '')
+                enqueue(page_data.get('links', []), base, depth + 1)
+        except Exception as e:
+            entry['error'] = str(e)
+            await pipeline.skip(entry)
+            return
+        finally:
+            await release()
+
+        await pipeline.submit(page_data, entry, f"report_{len(checked):05d}")
+
+    async def worker() -> None:
+        while True:
+            url, depth = await queue.get()
+            pipeline.stats['fetch'].sample(queue.qsize())
+            try:
+                await process(url, depth)
+            finally:
+                queue.task_done()
+
+    try:
+        async with pipeline:
+            tasks = [asyncio.create_task(worker()) for _ in range(concurrency)]
+            try:
+                await queue.join()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if http is not None:
+            await http.close()
+        await pool.close()
+        if snapshots is not None:
+            snapshots.flush()
+        if issue_stream is not None:
+            issue_stream.close()
+
+    if stats is not None:
+        stats.update(pipeline.stats_dict())
+    write_summary(summary, output_dir, pipeline.stats_dict())
+    return summary
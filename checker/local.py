@@ -0,0 +1,156 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from html import unescape
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, List, Optional, TextIO, Tuple, Union
+
+from report_maker import open_issue_stream, save_reports
+from rules import WCAGRule, Issue
+from .batch import new_entry, write_summary
+
+# Расширения HTML-файлов, которые проверяются при обходе каталога
+HTML_EXTENSIONS = ('.html', '.htm')
+
+_TITLE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def collect_files(directory: str, extensions: Iterable[str] = HTML_EXTENSIONS) -> List[str]:
+    """
+    Найти HTML-файлы в каталоге и его подкаталогах
+
+    :param directory: каталог
+    :param extensions: расширения файлов
+    :return: пути к файлам в алфавитном порядке
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    return sorted(
+        str(path) for path in Path(directory).rglob('*')
+        if path.suffix.lower() in extensions and path.is_file()
+    )
+
+
+def _page(html: str, url: str) -> dict:
+    """Данные локальной страницы в формате результата загрузки"""
+    title = _TITLE.search(html)
+    return {
+        'html': html,
+        'url': url,
+        'title': ' '.join(unescape(title.group(1)).split()) if title else '',
+        'status': None,
+        'fetched_via': 'file',
+    }
+
+
+def read_file(path: str) -> dict:
+    """
+    Прочитать локальный HTML-файл
+
+    :param path: путь к файлу
+    :return: словарь с ключами html, url (file://), title, status, fetched_via
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        html = f.read()
+    return _page(html, Path(path).resolve().as_uri())
+
+
+def read_stream(stream: Union[BinaryIO, TextIO], url: str = 'stdin') -> dict:
+    """
+    Прочитать HTML из потока (например, sys.stdin.buffer)
+
+    Байты декодируются как UTF-8, как и в read_file: кодировка консоли (например,
+    cp866 в Windows) к переданной странице отношения не имеет
+
+    :param stream: двоичный поток (текстовый читается как есть)
+    :param url: адрес страницы в отчёте
+    :return: словарь с ключами html, url, title, status, fetched_via
+    """
+    data = stream.read()
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='replace')
+    return _page(data, url)
+
+
+def _check_file(source: str, loader: Callable[[str], dict], filename: str, output_dir: str,
+                report_type: Union[str, Iterable[str]], check_options: dict,
+                keep_issues: bool = False, compress: bool = False) -> Tuple[dict, Optional[List[Issue]]]:
+    """
+    Прочитать, проверить страницу и сохранить отчёт (выполняется в процессе пула)
+
+    :return: запись сводки и нарушения (если keep_issues и страница проверена)
+    """
+    entry = new_entry(source)
+    issues = None
+    try:
+        page_data = loader(source)
+        meta = {'fetched_via': page_data['fetched_via']}
+        entry.update(final_url=page_data['url'], title=page_data['title'], status=page_data['status'], **meta)
+
+        issues = WCAGRule.run_all(page_data['html'], **check_options)
+        entry['issues'] = len(issues)
+        paths = save_reports(issues, page_data['url'], report_type,
+                             output_path=output_dir, filename=filename, meta=meta, compress=compress)
+        entry['report'] = paths[0]
+        if len(paths) > 1:
+            entry['reports'] = paths
+    except Exception as e:
+        entry['error'] = str(e)
+    return entry, issues if keep_issues else None
+
+
+def run_local(paths: List[str], output_dir: str, report_type: Union[str, Iterable[str]] = 'json',
+              workers: Optional[int] = None,
+              on_result: Optional[Callable[[dict], None]] = None,
+              loader: Callable[[str], dict] = read_file,
+              stream: Optional[str] = None, compress: bool = False,
+              **check_options) -> List[dict]:
+    """
+    Проверить локальные HTML-файлы без браузера и сети
+
+    Файлы читаются и проверяются параллельно в пуле процессов; на каждый файл
+    сохраняется отдельный отчёт, по завершении в каталог пишется summary.json
+
+    :param paths: пути к файлам (или другие источники, понятные loader)
+    :param output_dir: каталог для отчётов
+    :param report_type: формат отчётов ('json', 'html' или список форматов)
+    :param workers: число процессов (по умолчанию - по числу ядер)
+    :param on_result: вызывается с записью сводки после обработки каждого файла
+    :param loader: функция чтения страницы по источнику (должна передаваться в пул процессов)
+    :param stream: формат файла issues.<формат>, в который нарушения всех страниц
+        дописываются по мере проверки (см. report_maker.STREAM_FORMATS)
+    :param compress: сжимать файлы отчётов gzip
+    :param check_options: параметры WCAGRule.run_all (parser, rules, cache)
+    :return: записи сводки по каждому файлу (в порядке paths)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(paths)) or 1
+    tasks = [
+        (path, loader, f"report_{index + 1:05d}", output_dir, report_type, check_options,
+         bool(stream), compress)
+        for index, path in enumerate(paths)
+    ]
+    summary: List[dict] = [None] * len(paths)
+    issue_stream = open_issue_stream(output_dir, stream) if stream else None
+
+    def done(index: int, entry: dict, issues: Optional[List[Issue]]) -> None:
+        summary[index] = entry
+        if issue_stream is not None:
+            issue_stream.write_page(entry, issues)
+        if on_result is not None:
+            on_result(entry)
+
+    try:
+        if workers == 1:
+            for index, task in enumerate(tasks):
+                done(index, *_check_file(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_check_file, *task): index for index, task in enumerate(tasks)}
+                for future in as_completed(futures):
+                    done(futures[future], *future.result())
+    finally:
+        if issue_stream is not None:
+            issue_stream.close()
+
+    write_summary(summary, output_dir)
+    return summary
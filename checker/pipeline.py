@@ -0,0 +1,237 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from report_maker import IssueStreamWriter, save_reports
+from rules import WCAGRule, Issue
+from .snapshots import SnapshotStore
+
+# Этапы конвейера проверки в порядке прохождения страницы
+STAGES = ('fetch', 'check', 'report')
+
+
+@dataclass
+class StageStats:
+    """
+    Статистика этапа конвейера: число обработанных страниц, время работы
+    и глубина входной очереди
+    """
+    name: str
+    processed: int = 0  # Обработано страниц
+    errors: int = 0  # Из них с ошибкой
+    busy: float = 0.0  # Суммарное время обработки, с
+    first_start: Optional[float] = None  # Начало первой обработки (time.perf_counter)
+    last_end: Optional[float] = None  # Окончание последней обработки
+    queue_max: int = 0  # Наибольшая глубина входной очереди
+    _queue_total: int = 0
+    _queue_samples: int = 0
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """
+        Замерить обработку одной страницы (исключение считается ошибкой и пробрасывается)
+        """
+        started = time.perf_counter()
+        if self.first_start is None:
+            self.first_start = started
+        try:
+            yield
+        except BaseException:
+            self.errors += 1
+            raise
+        finally:
+            self.last_end = time.perf_counter()
+            self.busy += self.last_end - started
+            self.processed += 1
+
+    def sample(self, depth: int) -> None:
+        """
+        Учесть текущую глубину входной очереди
+
+        :param depth: число ожидающих страниц
+        """
+        self.queue_max = max(self.queue_max, depth)
+        self._queue_total += depth
+        self._queue_samples += 1
+
+    def to_dict(self) -> dict:
+        """
+        Статистика для сводки: throughput - страниц в секунду за время работы этапа,
+        mean_ms - среднее время обработки страницы, queue_mean - средняя глубина очереди
+        """
+        wall = (self.last_end - self.first_start) if self.processed else 0.0
+        return {
+            'processed': self.processed,
+            'errors': self.errors,
+            'throughput': round(self.processed / wall, 2) if wall > 0 else None,
+            'mean_ms': round(self.busy / self.processed * 1000, 1) if self.processed else None,
+            'queue_max': self.queue_max,
+            'queue_mean': round(self._queue_total / self._queue_samples, 1) if self._queue_samples else 0,
+        }
+
+
+def _check(html: str, check_options: dict) -> List[Issue]:
+    """Проверить страницу (выполняется в процессе пула)"""
+    return WCAGRule.run_all(html, **check_options)
+
+
+class CheckPipeline:
+    """
+    Конвейер проверки загруженных страниц: загрузка -> проверка -> отчёт
+
+    Загрузчики передают страницы через submit() в ограниченную очередь, из которой
+    их забирает пул процессов с правилами, а готовые результаты записываются в
+    отчёты по мере завершения. Когда очередь заполнена, submit() ждёт, поэтому
+    загрузка не опережает проверку и HTML не копится в памяти. Правила не
+    выполняются в цикле событий и не задерживают загрузку страниц
+
+    Используется как асинхронный контекстный менеджер: при выходе дожидается
+    обработки всех переданных страниц
+    """
+
+    def __init__(self, output_dir: str, report_type: Union[str, Iterable[str]], check_options: dict,
+                 workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 snapshots: Optional[SnapshotStore] = None,
+                 on_result: Optional[Callable[[dict], None]] = None,
+                 stream: Optional[IssueStreamWriter] = None, compress: bool = False):
+        """
+        :param output_dir: каталог для отчётов
+        :param report_type: формат отчётов ('json', 'html' или список форматов)
+        :param check_options: параметры WCAGRule.run_all (parser, rules, cache)
+        :param workers: число процессов для проверки (по умолчанию - по числу ядер)
+        :param queue_size: число загруженных страниц, ожидающих проверки
+            (по умолчанию - удвоенное число процессов)
+        :param snapshots: хранилище, в которое сохраняются снимки загруженных страниц
+        :param on_result: вызывается с записью сводки после записи отчёта страницы
+        :param stream: файл, в который нарушения страниц дописываются по мере проверки
+        :param compress: сжимать файлы отчётов gzip
+        """
+        self.output_dir = output_dir
+        self.report_type = report_type
+        self.check_options = check_options
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size or self.workers * 2
+        self.snapshots = snapshots
+        self.on_result = on_result
+        self.stream = stream
+        self.compress = compress
+        self.stats: Dict[str, StageStats] = {name: StageStats(name) for name in STAGES}
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._check_queue: Optional[asyncio.Queue] = None
+        self._report_queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def __aenter__(self) -> "CheckPipeline":
+        self._check_queue = asyncio.Queue(self.queue_size)
+        self._report_queue = asyncio.Queue(self.queue_size)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._tasks = [asyncio.create_task(self._checker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reporter()))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self._check_queue.join()
+                await self._report_queue.join()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._executor.shutdown(cancel_futures=True)
+
+    async def submit(self, page_data: dict, entry: dict, filename: str) -> None:
+        """
+        Передать загруженную страницу на проверку
+
+        Ждёт, пока в очереди проверки не освободится место
+
+        :param page_data: результат загрузки (html, url, title, status, ...)
+        :param entry: запись сводки страницы (заполняется по мере прохождения этапов)
+        :param filename: имя файла отчёта (расширение добавляется по формату)
+        """
+        if self.snapshots is not None:
+            await asyncio.to_thread(self.snapshots.save, entry['url'], page_data)
+
+        meta = {key: page_data[key] for key in ('fetched_via', 'fallback_reason') if key in page_data}
+        entry.update(final_url=page_data['url'], title=page_data['title'], status=page_data['status'],
+                     load=page_data.get('load'), **meta)
+        if 'blocked' in page_data:
+            entry['blocked'] = page_data['blocked']
+
+        self.stats['check'].sample(self._check_queue.qsize())
+        await self._check_queue.put((page_data['html'], entry, filename, meta))
+
+    async def skip(self, entry: dict) -> None:
+        """
+        Передать в отчётный этап запись страницы, которую не удалось загрузить или
+        не нужно проверять
+
+        :param entry: запись сводки с заполненным error или skipped (причина пропуска)
+        """
+        await self._report_queue.put((entry, None, None, None))
+
+    def stats_dict(self) -> Dict[str, dict]:
+        """
+        Статистика этапов для сводки
+        """
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    async def _checker(self) -> None:
+        """Этап check: проверка страниц из очереди в пуле процессов"""
+        loop = asyncio.get_running_loop()
+        while True:
+            html, entry, filename, meta = await self._check_queue.get()
+            try:
+                issues = None
+                try:
+                    with self.stats['check'].measure():
+                        issues = await loop.run_in_executor(self._executor, _check, html, self.check_options)
+                except Exception as e:
+                    entry['error'] = str(e)
+
+                self.stats['report'].sample(self._report_queue.qsize())
+                await self._report_queue.put((entry, issues, filename, meta))
+            finally:
+                self._check_queue.task_done()
+
+    async def _reporter(self) -> None:
+        """Этап report: запись отчётов по мере готовности результатов"""
+        while True:
+            entry, issues, filename, meta = await self._report_queue.get()
+            try:
+                if issues is not None:
+                    entry['issues'] = len(issues)
+                    try:
+                        with self.stats['report'].measure():
+                            paths = await asyncio.to_thread(
+                                save_reports, issues, entry['final_url'], self.report_type,
+                                output_path=self.output_dir, filename=filename, meta=meta,
+                                compress=self.compress
+                            )
+                        entry['report'] = paths[0]
+                        if len(paths) > 1:
+                            entry['reports'] = paths
+                    except Exception as e:
+                        entry['error'] = str(e)
+
+                if self.stream is not None and not entry.get('skipped'):
+                    try:
+                        await asyncio.to_thread(self.stream.write_page, entry, issues)
+                    except Exception as e:
+                        entry['error'] = str(e)
+                if self.on_result is not None:
+                    # Ошибка обработчика не должна останавливать этап: иначе очередь не опустеет
+                    try:
+                        self.on_result(entry)
+                    except Exception as e:
+                        print(f"Предупреждение: ошибка обработчика результата для {entry['url']}: {e}",
+                              file=sys.stderr)
+            finally:
+                self._report_queue.task_done()
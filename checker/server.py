@@ -0,0 +1,189 @@
+import asyncio
+import json
+import math
+from typing import Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from browser.exceptions import PageFetchError, PageFetchTimeout
+from browser.load import LoadStrategy
+from browser.pool import BrowserPool
+from rules import WCAGRule
+from rules.cache import ResultCache
+from .api import check_html, check_url
+
+# Максимальный размер тела запроса (HTML страницы), байт
+MAX_REQUEST_SIZE = 32 * 1024 * 1024
+
+
+class CheckService:
+    """
+    HTTP-сервис проверки доступности
+
+    Правила загружаются, а браузеры запускаются один раз при старте сервиса,
+    поэтому запрос платит только за загрузку страницы и проверку. Число
+    одновременных проверок ограничено, а запросы сверх очереди отклоняются
+    со статусом 503
+    """
+
+    def __init__(self, rules: Optional[List[type]] = None, parser: str = 'html.parser',
+                 cache: Optional[ResultCache] = None, concurrency: int = 4, queue_size: int = 32,
+                 timeout: int = 30, fetch_mode: str = 'browser', block: Iterable[str] = (),
+                 load: Optional[LoadStrategy] = None):
+        """
+        :param rules: классы правил (по умолчанию все)
+        :param parser: парсер HTML
+        :param cache: кэш результатов проверки
+        :param concurrency: число одновременно выполняемых проверок
+        :param queue_size: число запросов, ожидающих выполнения, сверх которого запросы отклоняются
+        :param timeout: таймаут загрузки страницы в секундах
+        :param fetch_mode: способ загрузки (см. browser.http_fetcher.FETCH_MODES)
+        :param block: блокируемые при загрузке ресурсы (см. browser.blocking.BLOCK_PRESETS)
+        :param load: условие готовности страницы
+        """
+        self.rules = rules if rules is not None else WCAGRule.get_all_rules()
+        self.parser = parser
+        self.cache = cache
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.fetch_mode = fetch_mode
+        self.block = block
+        self.load = load
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._active = 0
+        self._checked = 0
+        self._pool: Optional[BrowserPool] = None
+        self._http = None
+        self._fetcher = None
+
+    def make_app(self) -> web.Application:
+        """
+        Создать приложение aiohttp с маршрутами сервиса
+
+        POST /check - проверка страницы по url или переданного html;
+        GET /health - состояние сервиса
+        """
+        app = web.Application(client_max_size=MAX_REQUEST_SIZE)
+        app.router.add_post('/check', self.handle_check)
+        app.router.add_get('/health', self.handle_health)
+        app.on_startup.append(self._start)
+        app.on_cleanup.append(self._stop)
+        return app
+
+    async def _start(self, app: web.Application) -> None:
+        """Подготовить загрузчики и запустить браузеры"""
+        from browser.http_fetcher import make_fetcher
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._pool = BrowserPool(size=max(1, math.ceil(self.concurrency / 8)))
+        self._fetcher, self._http = make_fetcher(self.fetch_mode, self.timeout * 1000, self._pool,
+                                                 block=self.block, load=self.load)
+
+        if self.fetch_mode != 'http':
+            try:
+                await self._pool.start()
+            except Exception as e:
+                # Браузер будет запущен при первой загрузке; HTML можно проверять и без него
+                print(f"Предупреждение: не удалось запустить браузер: {e}")
+
+        # Разбор и проверка пустой страницы: импорт парсеров и прогрев правил до первого запроса
+        await asyncio.to_thread(WCAGRule.run_all, '<html></html>', parser=self.parser, rules=self.rules)
+
+    async def _stop(self, app: web.Application) -> None:
+        """Закрыть соединения и браузеры"""
+        if self._http is not None:
+            await self._http.close()
+        if self._pool is not None:
+            await self._pool.close()
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """
+        Состояние сервиса: число выполняемых и ожидающих проверок, число правил
+        """
+        return web.json_response({
+            'status': 'ok',
+            'active': self._active,
+            'queued': self._pending - self._active,
+            'checked': self._checked,
+            'rules': len(self.rules),
+            'fetch_mode': self.fetch_mode,
+        })
+
+    async def handle_check(self, request: web.Request) -> web.Response:
+        """
+        Проверить страницу
+
+        Тело запроса - JSON с ключом url (страница загружается) или html
+        (проверяется переданный HTML, url - необязательный адрес для отчёта)
+        """
+        try:
+            payload = await request.json()
+        except ValueError:
+            return _error(400, "Тело запроса должно быть JSON-объектом")
+        if not isinstance(payload, dict) or not (payload.get('url') or payload.get('html')):
+            return _error(400, "Укажите url страницы или html для проверки")
+        for key in ('url', 'html'):
+            if payload.get(key) is not None and not isinstance(payload[key], str):
+                return _error(400, f"Поле {key} должно быть строкой")
+        if not payload.get('html') and urlsplit(payload['url']).scheme not in ('http', 'https'):
+            return _error(400, "URL должен начинаться с http:// или https://")
+
+        if self._pending >= self.concurrency + self.queue_size:
+            return _error(503, "Очередь проверок заполнена", headers={'Retry-After': '1'})
+
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                self._active += 1
+                try:
+                    return await self._check(payload)
+                finally:
+                    self._active -= 1
+        finally:
+            self._pending -= 1
+
+    async def _check(self, payload: dict) -> web.Response:
+        """Загрузить (при необходимости) и проверить страницу"""
+        options = dict(rules=self.rules, parser=self.parser, cache=self.cache)
+        try:
+            if payload.get('html'):
+                result = await asyncio.to_thread(check_html, payload['html'], payload.get('url') or '', **options)
+                result.fetch = {'fetched_via': 'request'}
+            else:
+                result = await check_url(payload['url'], self._fetcher, **options)
+        except (PageFetchError, PageFetchTimeout) as e:
+            return _error(502, str(e))
+        except Exception as e:
+            return _error(500, f"Ошибка проверки: {e}")
+        self._checked += 1
+
+        data = result.to_dict()
+        data['total_issues'] = len(result.issues)
+        return web.json_response(data, dumps=_dumps)
+
+
+def _dumps(data) -> str:
+    """JSON без экранирования кириллицы"""
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _error(status: int, message: str, headers: Optional[dict] = None) -> web.Response:
+    """Ответ с описанием ошибки"""
+    return web.json_response({'error': message}, status=status, headers=headers, dumps=_dumps)
+
+
+def run_server(host: str = '127.0.0.1', port: int = 8080, **options) -> None:
+    """
+    Запустить сервис и обслуживать запросы до остановки (Ctrl+C)
+
+    :param host: адрес для прослушивания
+    :param port: порт
+    :param options: параметры CheckService
+    """
+    service = CheckService(**options)
+    print(f"Сервис проверки доступности: http://{host}:{port} (Ctrl+C для остановки)")
+    web.run_app(service.make_app(), host=host, port=port, print=None)
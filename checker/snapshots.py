@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Индексы хранилищ, прочитанные в текущем процессе (см. load_snapshot)
+_indexes: Dict[str, dict] = {}
+
+
+class SnapshotStore:
+    """
+    Хранилище снимков загруженных страниц
+
+    HTML хранится в сжатых файлах, адресуемых хэшем содержимого, поэтому
+    одинаковые страницы занимают место один раз. Индекс index.json сопоставляет
+    запрошенному URL хэш HTML, итоговый URL, заголовок, статус и время загрузки
+    """
+
+    INDEX = 'index.json'
+
+    def __init__(self, directory: str):
+        """
+        :param directory: каталог хранилища
+        """
+        self.directory = Path(directory)
+        self._index: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> dict:
+        """Индекс снимков по URL (читается при первом обращении)"""
+        if self._index is None:
+            self._index = _read_index(self.directory)
+        return self._index
+
+    def save(self, url: str, page_data: dict) -> str:
+        """
+        Сохранить снимок страницы
+
+        Индекс записывается на диск при вызове flush()
+
+        :param url: запрошенный адрес
+        :param page_data: результат загрузки (html, url, title, status)
+        :return: хэш HTML
+        """
+        html = page_data['html'].encode('utf-8', 'surrogatepass')
+        digest = hashlib.sha256(html).hexdigest()
+
+        path = _blob_path(self.directory, digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(html, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        entry = {
+            'hash': digest,
+            'final_url': page_data['url'],
+            'title': page_data.get('title'),
+            'status': page_data.get('status'),
+            'fetched_via': page_data.get('fetched_via'),
+            'timestamp': datetime.now().isoformat(),
+        }
+        with self._lock:
+            self.index[url] = entry
+        return digest
+
+    def flush(self) -> None:
+        """
+        Записать индекс на диск
+        """
+        with self._lock:
+            if self._index is None:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.directory / f"{self.INDEX}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.directory / self.INDEX)
+
+    def urls(self) -> List[str]:
+        """
+        Адреса сохранённых страниц в порядке сохранения
+        """
+        return list(self.index)
+
+
+def _blob_path(directory: Path, digest: str) -> Path:
+    """Путь к сжатому HTML по хэшу"""
+    return directory / 'blobs' / digest[:2] / f"{digest}.html.gz"
+
+
+def _read_index(directory: Path) -> dict:
+    """Прочитать индекс хранилища (пустой, если его нет)"""
+    try:
+        with open(directory / SnapshotStore.INDEX, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def load_snapshot(directory: str, url: str) -> dict:
+    """
+    Прочитать снимок страницы
+
+    Индекс хранилища читается один раз на процесс, поэтому функцию можно
+    передавать в пул процессов (через functools.partial)
+
+    :param directory: каталог хранилища
+    :param url: запрошенный адрес
+    :return: словарь с ключами html, url (итоговый), title, status, fetched_via, timestamp
+    """
+    if directory not in _indexes:
+        _indexes[directory] = _read_index(Path(directory))
+    entry = _indexes[directory].get(url)
+    if entry is None:
+        raise KeyError(f"Снимок страницы не найден: {url}")
+
+    with gzip.open(_blob_path(Path(directory), entry['hash']), 'rb') as f:
+        html = f.read().decode('utf-8', 'surrogatepass')
+
+    return {
+        'html': html,
+        'url': entry['final_url'],
+        'title': entry['title'],
+        'status': entry['status'],
+        'fetched_via': 'snapshot',
+        'timestamp': entry['timestamp'],
+    }
@@ -1,14 +1,31 @@
 """
 Чекер доступности веб-сайтов
 CLI инструмент для проверки доступности веб-страниц с использованием Playwright
+(локальные HTML-файлы проверяются без браузера)
 """
 
 import argparse
+import asyncio
+import multiprocessing
+import os
 import sys
+from datetime import datetime
+from functools import partial
 from urllib.parse import urlparse
-from browser.fetcher import fetch_page
-from report_maker import make_report, save_report_to_file, get_reports_directory
-from rules import WCAGRule
+from browser.blocking import BLOCK_PRESETS, validate_presets
+from browser.http_fetcher import FETCH_MODES
+from browser.load import LOAD_STRATEGIES, LoadStrategy
+from checker import (read_urls, run_batch, run_crawl, collect_files, read_file, read_stream, run_local,
+                     SnapshotStore, load_snapshot)
+from report_maker import (REPORT_TYPES, STREAM_FORMATS, build_report_model, render_report, write_reports,
+                          get_reports_directory)
+from rules import WCAGRule, PARSERS
+from rules.cache import ResultCache
+from profiling import Profiler, profiled
+
+
+# Каталог хранилища снимков страниц по умолчанию
+SNAPSHOTS_DIR = os.path.join('accessibility_reports', 'snapshots')
 
 
 def validate_url(url: str) -> bool:
@@ -24,6 +41,26 @@ def validate_url(url: str) -> bool:
         return False
 
 
+def local_target(target: str):
+    """
+    Тип локального источника HTML: 'stdin', 'file', 'dir' или None для URL
+    """
+    if target == '-':
+        return 'stdin'
+    if validate_url(target):
+        return None
+    if os.path.isdir(target):
+        return 'dir'
+    if os.path.isfile(target):
+        return 'file'
+    return None
+
+
+def comma_list(value: str) -> list:
+    """Разбор списка значений через запятую"""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
 def parse_arguments():
     """Парсинг аргументов командной строки"""
     parser = argparse.ArgumentParser(
@@ -35,19 +72,65 @@ python main.py https://example.com
 python main.py https://example.com --report json --timeout 30
 python main.py https://example.com --report json --filename report.json
 python main.py https://example.com --report html --filename accessibility_report.html
+python main.py https://example.com --report json,html,console
+python main.py https://example.com --level A --exclude-rules reflow,status_messages
+python main.py --input urls.txt --concurrency 8 --report html
+python main.py --input urls.txt --report json --stream ndjson
+python main.py https://example.com --crawl --max-depth 3 --max-pages 500
+python main.py https://example.com --block images,media,fonts,trackers
+python main.py https://example.com --wait settled --settle-ms 300
+python main.py --input urls.txt --fetch auto
+python main.py ./public --workers 8
+cat page.html | python main.py -
+python main.py --input urls.txt --save-snapshots
+python main.py --from-snapshots --exclude-rules reflow
+python main.py --serve --port 8080 --fetch auto
+python main.py https://example.com --wait selector --wait-selector "#app main"
         '''
     )
 
     parser.add_argument(
         'url',
-        help='URL веб-сайта для проверки доступности'
+        nargs='?',
+        help='URL веб-сайта для проверки доступности, путь к HTML-файлу или каталогу '
+             '(проверяются все .html/.htm в нём и подкаталогах), либо - для чтения HTML из stdin'
+    )
+
+    parser.add_argument(
+        '-i', '--input',
+        dest='input',
+        metavar='FILE',
+        help='Файл со списком URL (по одному в строке; - для чтения из stdin) для пакетной проверки'
+    )
+
+    parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        default=4,
+        metavar='N',
+        help='Число одновременно загружаемых страниц в пакетном режиме и одновременных проверок сервиса (по умолчанию: 4)'
     )
 
     parser.add_argument(
         '-r', '--report',
-        choices=['json', 'html', 'console'],
-        default='console',
-        help='Формат вывода отчёта (по умолчанию: console)'
+        type=comma_list,
+        default=['console'],
+        metavar='FORMAT[,FORMAT]',
+        help=f'Форматы отчёта через запятую: {", ".join(REPORT_TYPES)} (по умолчанию: console); '
+             'все форматы строятся из одной проверки'
+    )
+
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Сохранять файлы отчётов сжатыми gzip (.json.gz, .html.gz)'
+    )
+
+    parser.add_argument(
+        '--stream',
+        choices=STREAM_FORMATS,
+        help='В пакетном режиме, при обходе и проверке каталога дописывать нарушения всех страниц по мере '
+             'проверки в один файл issues.ndjson (нарушение в строке) или issues.json; сводка - в конце файла'
     )
 
     parser.add_argument(
@@ -66,40 +149,467 @@ python main.py https://example.com --report html --filename accessibility_report
         help='Файл для сохранения отчёта (для json/html)'
     )
 
+    parser.add_argument(
+        '--fetch',
+        choices=FETCH_MODES,
+        default='browser',
+        help='Способ загрузки: browser - в браузере, auto - по HTTP, а в браузере только страницы, '
+             'которым нужен JavaScript, http - только по HTTP (по умолчанию: browser)'
+    )
+
+    parser.add_argument(
+        '--wait',
+        choices=LOAD_STRATEGIES,
+        default='networkidle',
+        help='Когда считать страницу загруженной: событие навигации, появление элемента (selector) '
+             'или пауза в изменениях DOM (settled) (по умолчанию: networkidle)'
+    )
+
+    parser.add_argument(
+        '--wait-selector',
+        dest='wait_selector',
+        metavar='CSS',
+        help='CSS-селектор элемента, появления которого ждать (для --wait selector)'
+    )
+
+    parser.add_argument(
+        '--settle-ms',
+        dest='settle_ms',
+        type=int,
+        default=500,
+        metavar='N',
+        help='Сколько мс DOM не должен меняться (для --wait settled, по умолчанию: 500)'
+    )
+
+    parser.add_argument(
+        '--settle-cap-ms',
+        dest='settle_cap_ms',
+        type=int,
+        default=10000,
+        metavar='N',
+        help='Предельное время ожидания паузы в изменениях DOM в мс (для --wait settled, по умолчанию: 10000)'
+    )
+
+    parser.add_argument(
+        '-b', '--block',
+        type=comma_list,
+        default=[],
+        metavar='LIST',
+        help=f'Не загружать ресурсы страницы, через запятую: {", ".join(BLOCK_PRESETS)}'
+    )
+
+    parser.add_argument(
+        '-p', '--parser',
+        choices=PARSERS,
+        default='html.parser',
+        help='Парсер HTML для проверки правил (по умолчанию: html.parser)'
+    )
+
+    parser.add_argument(
+        '--level',
+        dest='levels',
+        type=comma_list,
+        metavar='LEVELS',
+        help='Проверять только правила указанных уровней, через запятую (например: A,AA)'
+    )
+
+    parser.add_argument(
+        '--criteria',
+        type=comma_list,
+        metavar='LIST',
+        help='Проверять только указанные критерии WCAG, через запятую (например: 1.1.1,2.4.4)'
+    )
+
+    parser.add_argument(
+        '--exclude-rules',
+        dest='exclude_rules',
+        type=comma_list,
+        metavar='LIST',
+        help='Не загружать и не выполнять указанные правила (имя модуля или класса), через запятую'
+    )
+
+    parser.add_argument(
+        '--crawl',
+        action='store_true',
+        help='Обойти и проверить страницы сайта по ссылкам в пределах его домена'
+    )
+
+    parser.add_argument(
+        '--max-depth',
+        dest='max_depth',
+        type=int,
+        default=2,
+        metavar='N',
+        help='Максимальная глубина ссылок от начальной страницы при обходе (по умолчанию: 2)'
+    )
+
+    parser.add_argument(
+        '--max-pages',
+        dest='max_pages',
+        type=int,
+        default=100,
+        metavar='N',
+        help='Максимальное число проверяемых страниц при обходе (по умолчанию: 100)'
+    )
+
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Запустить HTTP-сервис проверки (POST /check с url или html, GET /health) '
+             'с заранее запущенным браузером и загруженными правилами'
+    )
+
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Адрес сервиса (по умолчанию: 127.0.0.1)'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8080,
+        help='Порт сервиса (по умолчанию: 8080)'
+    )
+
+    parser.add_argument(
+        '--queue-size',
+        dest='queue_size',
+        type=int,
+        default=32,
+        metavar='N',
+        help='Сколько запросов сервиса может ожидать проверки, остальные отклоняются с кодом 503; '
+             'в пакетном режиме и при обходе - сколько загруженных страниц может ожидать проверки, '
+             'после чего загрузка приостанавливается (по умолчанию: 32)'
+    )
+
+    parser.add_argument(
+        '--save-snapshots',
+        dest='save_snapshots',
+        nargs='?',
+        const=SNAPSHOTS_DIR,
+        metavar='DIR',
+        help=f'Сохранять снимки загруженных страниц (HTML, итоговый URL, заголовок, статус) в каталог '
+             f'(по умолчанию: {SNAPSHOTS_DIR})'
+    )
+
+    parser.add_argument(
+        '--from-snapshots',
+        dest='from_snapshots',
+        nargs='?',
+        const=SNAPSHOTS_DIR,
+        metavar='DIR',
+        help=f'Проверить все сохранённые снимки страниц без браузера и сети (по умолчанию: {SNAPSHOTS_DIR})'
+    )
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        nargs='?',
+        const=os.cpu_count() or 1,
+        metavar='N',
+        help='Выполнять правила параллельно в N процессах (без значения - по числу ядер); в пакетном режиме, '
+             'при обходе и проверке каталога - число процессов для проверки страниц (по умолчанию по числу ядер)'
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Кэшировать результаты проверки в ./accessibility_reports/.cache (неизменённые страницы не проверяются повторно)'
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        dest='cache_size',
+        type=int,
+        default=256,
+        metavar='MB',
+        help='Максимальный размер кэша в мегабайтах (по умолчанию: 256)'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Замерить время и пиковую память каждого этапа и правила и добавить их в отчёт'
+    )
+
     return parser.parse_args()
 
 
+def fetch(args, profiler, load) -> dict:
+    """
+    Загрузка страницы по URL с выводом сведений о загрузке
+    """
+    from browser.fetcher import fetch_page
+
+    with profiled(profiler, 'fetch'):
+        page_data = fetch_page(args.url, args.timeout, profiler, block=args.block, load=load, mode=args.fetch)
+
+    if page_data['fetched_via'] == 'http':
+        print(f"✓ Загружено по HTTP: {page_data['title']} ({page_data['status']})")
+    else:
+        print(f"✓ Загружено: {page_data['title']} ({page_data['status']}) "
+              f"за {page_data['load']['waited_ms']} мс ({page_data['load']['strategy']})")
+    if page_data.get('fallback_reason'):
+        print(f"  Загрузка в браузере: {page_data['fallback_reason']}")
+    if 'blocked' in page_data:
+        blocked = ', '.join(f"{preset}: {count}" for preset, count in page_data['blocked'].items())
+        print(f"✓ Заблокировано запросов: {blocked}")
+    return page_data
+
+
+def print_pipeline_stats(stats: dict):
+    """Вывести статистику этапов конвейера пакетной проверки"""
+    titles = {'fetch': 'Загрузка', 'check': 'Проверка', 'report': 'Отчёты'}
+    print(f"\n{'Этап':<12}{'Страниц':>9}{'Ошибок':>8}{'Стр/с':>9}{'Сред., мс':>11}{'Очередь (макс/сред)':>22}")
+    for name, stage in stats.items():
+        throughput = f"{stage['throughput']:.2f}" if stage['throughput'] is not None else '-'
+        mean = f"{stage['mean_ms']:.1f}" if stage['mean_ms'] is not None else '-'
+        queue = f"{stage['queue_max']}/{stage['queue_mean']}"
+        print(f"{titles.get(name, name):<12}{stage['processed']:>9}{stage['errors']:>8}{throughput:>9}{mean:>11}{queue:>22}")
+
+
+def batch_mode(args, rules, cache, load):
+    """
+    Пакетная проверка списка URL, обход сайта или проверка каталога HTML-файлов:
+    отчёт на каждую страницу и общая сводка
+
+    Завершает процесс с кодом 0, если все страницы загружены и нарушений нет
+    """
+    report_type = [t for t in args.report if t != 'console']
+    if len(report_type) < len(args.report):
+        print("Предупреждение: В пакетном режиме отчёты сохраняются в файлы, формат console не используется",
+              file=sys.stderr)
+    if not report_type:
+        report_type = ['json']
+    if args.filename:
+        print("Предупреждение: Аргумент --filename игнорируется в пакетном режиме", file=sys.stderr)
+
+    if args.from_snapshots:
+        mode = 'snapshots'
+    elif args.crawl:
+        mode = 'crawl'
+    elif args.input is None:
+        mode = 'local'
+    else:
+        mode = 'batch'
+    output_dir = os.path.join(get_reports_directory(), f"{mode}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    check_options = dict(parser=args.parser, rules=rules, cache=cache)
+
+    if mode == 'crawl':
+        total = None
+        print(f"\nОбход сайта: {args.url} (глубина: {args.max_depth}, страниц: до {args.max_pages})")
+    elif mode == 'snapshots':
+        sources = SnapshotStore(args.from_snapshots).urls()
+        if not sources:
+            print(f"Ошибка: В каталоге {args.from_snapshots} нет снимков страниц", file=sys.stderr)
+            sys.exit(1)
+
+        total = len(sources)
+        print(f"\nПроверка снимков: {args.from_snapshots} (страниц: {total})")
+    elif mode == 'local':
+        sources = collect_files(args.url)
+        if not sources:
+            print(f"Ошибка: В каталоге {args.url} нет HTML-файлов", file=sys.stderr)
+            sys.exit(1)
+
+        total = len(sources)
+        print(f"\nПроверка файлов: {args.url} (HTML-файлов: {total})")
+    else:
+        try:
+            if args.input == '-':
+                urls = read_urls(sys.stdin)
+            else:
+                with open(args.input, encoding='utf-8') as f:
+                    urls = read_urls(f)
+        except OSError as e:
+            print(f"Ошибка: Не удалось прочитать список URL: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if not urls:
+            print("Ошибка: Список URL пуст", file=sys.stderr)
+            sys.exit(1)
+
+        total = len(urls)
+        print(f"\nПакетная проверка: {total} URL")
+    workers = args.workers or os.cpu_count() or 1
+    if mode in ('local', 'snapshots'):
+        print(f"Формат: {', '.join(report_type)} | Процессов: {workers}\n")
+    else:
+        print(f"Формат: {', '.join(report_type)} | Таймаут: {args.timeout}s | Одновременно: {args.concurrency} | "
+              f"Процессов: {workers}\n")
+
+    done = 0
+
+    def on_result(entry):
+        nonlocal done
+        done += 1
+        position = f"{done}/{total}" if total else str(done)
+        if entry['error']:
+            print(f"✗ [{position}] {entry['url']}: {entry['error']}")
+        elif entry.get('skipped'):
+            print(f"- [{position}] {entry['url']}: пропущена: {entry['skipped']}")
+        else:
+            print(f"✓ [{position}] {entry['url']}: найдено проблем: {entry['issues']}")
+
+    snapshots = SnapshotStore(args.save_snapshots) if args.save_snapshots else None
+    stats = {}
+    fetch_options = dict(timeout=args.timeout, concurrency=args.concurrency, block=args.block, load=load,
+                         fetch_mode=args.fetch, snapshots=snapshots, workers=args.workers,
+                         queue_size=args.queue_size, stats=stats, stream=args.stream, compress=args.gzip)
+    if mode in ('local', 'snapshots'):
+        # Страницы проверяются параллельно, поэтому правила внутри страницы выполняются последовательно
+        loader = partial(load_snapshot, args.from_snapshots) if mode == 'snapshots' else read_file
+        summary = run_local(sources, output_dir, report_type, workers=args.workers, on_result=on_result,
+                            loader=loader, stream=args.stream, compress=args.gzip, **check_options)
+    elif mode == 'crawl':
+        summary = asyncio.run(run_crawl(
+            args.url, output_dir, report_type, max_depth=args.max_depth, max_pages=args.max_pages,
+            on_result=on_result, **fetch_options, **check_options
+        ))
+    else:
+        summary = asyncio.run(run_batch(
+            urls, output_dir, report_type, validate=validate_url,
+            on_result=on_result, **fetch_options, **check_options
+        ))
+
+    failed = sum(1 for entry in summary if entry['error'])
+    skipped = sum(1 for entry in summary if entry.get('skipped'))
+    total_issues = sum(entry['issues'] or 0 for entry in summary)
+    print(f"\n✓ Проверено страниц: {len(summary) - failed - skipped}, с ошибками: {failed}, "
+          f"найдено проблем: {total_issues}")
+    if skipped:
+        print(f"✓ Пропущено перенаправлений на уже проверенные страницы: {skipped}")
+    if stats:
+        print_pipeline_stats(stats)
+    print(f"✓ Отчёты сохранены: {output_dir}\n")
+
+    sys.exit(0 if failed == 0 and total_issues == 0 else 1)
+
+
 def main():
     """Основная функция"""
     try:
         args = parse_arguments()
 
-        if not validate_url(args.url):
+        sources = [args.url is not None, args.input is not None, args.from_snapshots is not None, args.serve]
+        if sources.count(True) != 1:
+            print("Ошибка: Укажите либо URL, либо файл со списком URL (--input), либо каталог снимков "
+                  "(--from-snapshots), либо запустите сервис (--serve)", file=sys.stderr)
+            sys.exit(1)
+
+        local = local_target(args.url) if args.url is not None else None
+        if args.url is not None and local is None and not validate_url(args.url):
             print(f"Ошибка: Некорректный URL '{args.url}'", file=sys.stderr)
-            print("URL должен начинаться с http:// или https://", file=sys.stderr)
+            print("URL должен начинаться с http:// или https://; для локальной проверки укажите путь "
+                  "к существующему файлу или каталогу, либо - для чтения из stdin", file=sys.stderr)
+            sys.exit(1)
+
+        unknown = [t for t in args.report if t not in REPORT_TYPES]
+        if unknown or not args.report:
+            print(f"Ошибка: Неизвестный формат отчёта: {', '.join(unknown) or '-'}. "
+                  f"Доступны: {', '.join(REPORT_TYPES)}", file=sys.stderr)
             sys.exit(1)
+        args.report = list(dict.fromkeys(args.report))
 
         if args.timeout <= 0:
             print(f"Ошибка: Таймаут должен быть положительным числом, получено: {args.timeout}", file=sys.stderr)
             sys.exit(1)
 
-        if args.filename and args.report == 'console':
+        if args.crawl and (args.url is None or local is not None):
+            print("Ошибка: Для обхода сайта (--crawl) укажите начальный URL", file=sys.stderr)
+            sys.exit(1)
+
+        if args.input == '-' and local == 'stdin':
+            print("Ошибка: stdin нельзя использовать одновременно для HTML и списка URL", file=sys.stderr)
+            sys.exit(1)
+
+        if args.max_depth < 0 or args.max_pages <= 0:
+            print("Ошибка: Глубина обхода не может быть отрицательной, а число страниц должно быть положительным",
+                  file=sys.stderr)
+            sys.exit(1)
+
+        if args.concurrency <= 0:
+            print(f"Ошибка: Число одновременных загрузок должно быть положительным, получено: {args.concurrency}", file=sys.stderr)
+            sys.exit(1)
+
+        if args.queue_size < 0:
+            print(f"Ошибка: Размер очереди не может быть отрицательным, получено: {args.queue_size}", file=sys.stderr)
+            sys.exit(1)
+
+        if args.workers is not None and args.workers <= 0:
+            print(f"Ошибка: Число процессов должно быть положительным, получено: {args.workers}", file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            validate_presets(args.block)
+            load = LoadStrategy(args.wait, args.wait_selector, args.settle_ms, args.settle_cap_ms)
+        except ValueError as e:
+            print(f"Ошибка: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            rules = WCAGRule.select_rules(args.levels, args.criteria, args.exclude_rules)
+        except ValueError as e:
+            print(f"Ошибка: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        if not rules:
+            print("Ошибка: Под заданные фильтры не подходит ни одно правило", file=sys.stderr)
+            sys.exit(1)
+
+        if args.filename and args.report == ['console']:
             print("Предупреждение: Аргумент --filename игнорируется при формате отчета 'console'", file=sys.stderr)
 
+        if args.stream and args.input is None and not args.crawl and local != 'dir' and not args.from_snapshots:
+            print("Предупреждение: Аргумент --stream используется только при проверке нескольких страниц", file=sys.stderr)
+
+        cache = None
+        if args.cache:
+            cache = ResultCache(os.path.join(get_reports_directory(), '.cache'), args.cache_size * 1024 * 1024)
+
+        if args.serve:
+            from checker.server import run_server
+
+            run_server(args.host, args.port, rules=rules, parser=args.parser, cache=cache,
+                       concurrency=args.concurrency, queue_size=args.queue_size, timeout=args.timeout,
+                       fetch_mode=args.fetch, block=args.block, load=load)
+            sys.exit(0)
+
+        if args.input is not None or args.crawl or local == 'dir' or args.from_snapshots:
+            batch_mode(args, rules, cache, load)
+
         print(f"\nПроверка: {args.url}")
-        print(f"Формат: {args.report} | Таймаут: {args.timeout}s\n")
+        if local is None:
+            print(f"Формат: {', '.join(args.report)} | Таймаут: {args.timeout}s\n")
+        else:
+            print(f"Формат: {', '.join(args.report)}\n")
+
+        profiler = Profiler() if args.profile else None
+        if profiler:
+            profiler.start()
 
         # Загрузка страницы
         try:
-            page_data = fetch_page(args.url, args.timeout)
-            print(f"✓ Загружено: {page_data['title']} ({page_data['status']})")
+            if local is not None:
+                with profiled(profiler, 'read'):
+                    page_data = read_stream(sys.stdin.buffer) if local == 'stdin' else read_file(args.url)
+                print(f"✓ Прочитано: {page_data['title'] or page_data['url']} ({len(page_data['html'])} символов)")
+            else:
+                page_data = fetch(args, profiler, load)
+                if args.save_snapshots:
+                    snapshots = SnapshotStore(args.save_snapshots)
+                    snapshots.save(args.url, page_data)
+                    snapshots.flush()
         except Exception as e:
             print(f"✗ Ошибка загрузки: {e}", file=sys.stderr)
             sys.exit(1)
 
         # Проверка правил WCAG
         try:
-            issues = WCAGRule.run_all(page_data['html'])
+            with profiled(profiler, 'check'):
+                issues = WCAGRule.run_all(page_data['html'], parser=args.parser, profiler=profiler, rules=rules,
+                                          workers=args.workers, cache=cache)
             print(f"✓ Найдено проблем: {len(issues)}\n")
         except Exception as e:
             print(f"✗ Ошибка проверки: {e}", file=sys.stderr)
@@ -109,23 +619,25 @@ def main():
 
         # Генерация отчёта
         try:
-            if args.report == 'console':
-                report_content = make_report(issues, page_data['url'], 'console')
-                print(report_content)
-            else:
-                if args.filename:
-                    file_path = save_report_to_file(
-                        issues, page_data['url'], args.report,
-                        filename=args.filename
-                    )
-                else:
-                    reports_dir = get_reports_directory()
-                    file_path = save_report_to_file(
-                        issues, page_data['url'], args.report,
-                        output_path=reports_dir
-                    )
-
-                print(f"✓ Отчёт сохранён: {file_path}\n")
+            profile = profiler.to_list() if profiler else None
+            meta = {key: page_data[key] for key in ('fetched_via', 'fallback_reason') if key in page_data}
+            with profiled(profiler, 'report'):
+                # Модель отчёта строится один раз для всех форматов
+                report_data = build_report_model(issues, page_data['url'], profile=profile, meta=meta)
+                if 'console' in args.report:
+                    print(render_report(report_data, 'console'))
+
+                file_types = [t for t in args.report if t != 'console']
+                if file_types:
+                    for file_path in write_reports(report_data, file_types, get_reports_directory(), args.filename,
+                                                   compress=args.gzip):
+                        print(f"✓ Отчёт сохранён: {file_path}")
+                    print()
+
+            if profiler:
+                profiler.stop()
+                report_stage = profiler.records[-1]
+                print(f"⏱ Отчёт сформирован за {report_stage.wall * 1000:.1f} мс")
 
         except Exception as e:
             print(f"✗ Ошибка при создании отчёта: {e}", file=sys.stderr)
@@ -146,4 +658,5 @@ def main():
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,7 @@
+from .profiler import Profiler, StageRecord, profiled
+
+__all__ = [
+    'Profiler',
+    'StageRecord',
+    'profiled'
+]
@@ -0,0 +1,149 @@
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Iterator
+
+
+@dataclass
+class StageRecord:
+    """
+    Замер одного этапа проверки или одного правила
+    """
+    name: str  # Название этапа или правила
+    kind: str  # Тип замера: stage (этап) или rule (правило)
+    wall: float  # Реальное время, с
+    cpu: float  # Процессорное время, с
+    peak_memory: Optional[int] = None  # Пиковый объём выделенной памяти, байт (tracemalloc)
+
+
+class Profiler:
+    """
+    Сбор времени и пиковой памяти по этапам проверки и по правилам
+
+    Память отслеживается через tracemalloc, поэтому при профилировании проверка
+    заметно замедляется; без профилировщика замеры не выполняются вовсе
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """
+        :param trace_memory: отслеживать пиковую память через tracemalloc
+        """
+        self.trace_memory = trace_memory
+        self.records: List[StageRecord] = []
+        # Открытые этапы: [текущая память при входе, пик внутри этапа]
+        self._stack: List[List[int]] = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """
+        Включить отслеживание памяти
+        """
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """
+        Выключить отслеживание памяти (если его включил этот профилировщик)
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str, kind: str = 'stage') -> Iterator[None]:
+        """
+        Замерить время и пиковую память блока кода
+
+        :param name: название этапа
+        :param kind: тип замера (stage или rule)
+        """
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            self._update_peaks()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self._stack.append([current, 0])
+
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak = None
+            if tracing and tracemalloc.is_tracing():
+                self._update_peaks()
+                peak = self._stack.pop()[1]
+            elif tracing:
+                self._stack.pop()
+            self.records.append(StageRecord(name, kind, wall, cpu, peak))
+
+    def record(self, name: str, wall: float, cpu: float, kind: str = 'rule',
+               peak_memory: Optional[int] = None) -> None:
+        """
+        Добавить замер, выполненный вне stage() (например, накопленный за общий обход)
+
+        :param name: название этапа или правила
+        :param wall: реальное время, с
+        :param cpu: процессорное время, с
+        :param kind: тип замера
+        :param peak_memory: пиковый объём выделенной памяти, байт
+        """
+        self.records.append(StageRecord(name, kind, wall, cpu, peak_memory))
+
+    def memory_mark(self) -> Optional[int]:
+        """
+        Начать замер пиковой памяти короткого вызова внутри открытого этапа
+
+        Пик открытых этапов учитывается до сброса, поэтому их замеры не искажаются
+
+        :return: текущий объём памяти (None, если память не отслеживается)
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        self._update_peaks()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return current
+
+    def memory_peak(self, mark: Optional[int]) -> Optional[int]:
+        """
+        Пик памяти с момента memory_mark()
+
+        :param mark: результат memory_mark()
+        :return: прирост пиковой памяти, байт (None, если память не отслеживается)
+        """
+        if mark is None or not tracemalloc.is_tracing():
+            return None
+        self._update_peaks()
+        _, peak = tracemalloc.get_traced_memory()
+        return max(peak - mark, 0)
+
+    def to_list(self) -> List[dict]:
+        """
+        Замеры в виде списка словарей (для отчётов)
+        """
+        return [asdict(r) for r in self.records]
+
+    def _update_peaks(self) -> None:
+        """
+        Учесть пик памяти с последнего сброса во всех открытых этапах
+        """
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame[1] = max(frame[1], peak - frame[0])
+
+
+def profiled(profiler: Optional[Profiler], name: str, kind: str = 'stage'):
+    """
+    Контекст замера этапа, ничего не делающий без профилировщика
+
+    :param profiler: профилировщик или None
+    :param name: название этапа
+    :param kind: тип замера
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name, kind)
@@ -1,14 +1,35 @@
-from .report import make_report
-from .file_export import save_report_to_file, get_reports_directory
-from .console import generate_console_report
-from .json import generate_json_report
-from .html import generate_html_report
+from .report import REPORT_TYPES, build_report_model, render_report, make_report
+from .file_export import save_report_to_file, save_reports, write_reports, get_reports_directory
+from .stream import STREAM_FORMATS, IssueStreamWriter, open_issue_stream
 
 __all__ = [
+    'REPORT_TYPES',
+    'build_report_model',
+    'render_report',
     'make_report',
     'save_report_to_file',
+    'save_reports',
+    'write_reports',
     'get_reports_directory',
+    'STREAM_FORMATS',
+    'IssueStreamWriter',
+    'open_issue_stream',
     'generate_console_report',
     'generate_json_report',
     'generate_html_report'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    # Генераторы отчётов импортируются при первом обращении: console тянет colorama,
+    # html - jinja2, а для JSON-отчёта ни то ни другое не нужно
+    if name == 'generate_console_report':
+        from .console import generate_console_report
+        return generate_console_report
+    if name == 'generate_json_report':
+        from .json import generate_json_report
+        return generate_json_report
+    if name == 'generate_html_report':
+        from .html import generate_html_report
+        return generate_html_report
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
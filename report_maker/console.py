@@ -18,10 +18,12 @@ def generate_console_report(report_data: dict) -> str:
 
     lines.append(f"URL: {Fore.BLUE}{report_data['url']}")
     lines.append(f"Время проверки: {report_data['timestamp']}")
+    if report_data.get("fetch_description"):
+        lines.append(f"Способ загрузки: {report_data['fetch_description']}")
     lines.append(f"Общее количество проблем: {Fore.RED}{report_data['total_issues']}")
     lines.append("")
 
-    summary = _get_level_summary(report_data["issues"])
+    summary = report_data["summary"]["by_level"]
     lines.append(f"{Fore.YELLOW}{Style.BRIGHT}СВОДКА ПО УРОВНЯМ:")
     lines.append("-" * 30)
     for level, count in summary.items():
@@ -52,19 +54,35 @@ def generate_console_report(report_data: dict) -> str:
     else:
         lines.append(f"{Fore.GREEN}{Style.BRIGHT}Проблемы доступности не найдены!")
 
+    if report_data.get("profile"):
+        lines.append("")
+        lines.extend(_format_profile(report_data["profile"]))
+
     lines.append("\n" + "=" * 80)
 
     return "\n".join(lines)
 
 
-def _get_level_summary(grouped_issues: list) -> dict:
-    """Создает сводку по уровням критичности"""
-    summary = {"A": 0, "AA": 0, "AAA": 0}
-    for group in grouped_issues:
-        level = group["level"]
-        if level in summary:
-            summary[level] += group["count"]
-    return summary
+def _format_profile(profile: list) -> list:
+    """Форматирует замеры времени и памяти по этапам и правилам"""
+    lines = [
+        f"{Fore.YELLOW}{Style.BRIGHT}ПРОФИЛИРОВАНИЕ:",
+        "-" * 80,
+        f"{'Этап / правило':<44}{'Время, мс':>12}{'CPU, мс':>12}{'Память, КБ':>12}",
+    ]
+
+    for kind, title in (("stage", "Этапы"), ("rule", "Правила")):
+        records = [r for r in profile if r["kind"] == kind]
+        if not records:
+            continue
+        lines.append(f"{Fore.CYAN}{title}:")
+        if kind == "rule":
+            records = sorted(records, key=lambda r: r["wall"], reverse=True)
+        for r in records:
+            memory = f"{r['peak_memory'] / 1024:.1f}" if r["peak_memory"] is not None else "-"
+            lines.append(f"  {r['name'][:42]:<42}{r['wall'] * 1000:>12.1f}{r['cpu'] * 1000:>12.1f}{memory:>12}")
+
+    return lines
 
 
 def _get_level_color(level: str) -> str:
@@ -1,14 +1,17 @@
+import gzip
 import os
 from pathlib import Path
 from urllib.parse import urlparse
 from datetime import datetime
-from typing import Optional
-from .report import make_report
+from typing import Iterable, List, Optional, Union
+from .report import build_report_model, render_report
 
 
 def save_report_to_file(issues, url: str, report_type: str,
                         output_path: Optional[str] = None,
-                        filename: Optional[str] = None) -> str:
+                        filename: Optional[str] = None,
+                        profile: Optional[List[dict]] = None,
+                        meta: Optional[dict] = None) -> str:
     """
     Генерирует и сохраняет отчет в файл
 
@@ -17,9 +20,55 @@ def save_report_to_file(issues, url: str, report_type: str,
     :param report_type: Тип отчета ('json', 'html')
     :param output_path: Путь для сохранения (по умолчанию текущая директория)
     :param filename: Имя файла (автогенерируется если не указано)
+    :param profile: Замеры времени и памяти по этапам и правилам
+    :param meta: Сведения о загрузке страницы
     :return: Полный путь к сохраненному файлу
     """
-    if report_type not in ['json', 'html']:
+    return save_reports(issues, url, [report_type], output_path, filename, profile=profile, meta=meta)[0]
+
+
+def save_reports(issues, url: str, report_types: Union[str, Iterable[str]],
+                 output_path: Optional[str] = None,
+                 filename: Optional[str] = None,
+                 profile: Optional[List[dict]] = None,
+                 meta: Optional[dict] = None,
+                 compress: bool = False) -> List[str]:
+    """
+    Генерирует и сохраняет отчеты в нескольких форматах из одной модели отчёта
+
+    :param issues: Список найденных нарушений
+    :param url: URL проверенной страницы
+    :param report_types: Типы отчетов ('json', 'html') или один тип
+    :param output_path: Путь для сохранения (по умолчанию текущая директория)
+    :param filename: Имя файла (автогенерируется если не указано)
+    :param profile: Замеры времени и памяти по этапам и правилам
+    :param meta: Сведения о загрузке страницы
+    :param compress: Сжимать файлы gzip (к имени добавляется .gz)
+    :return: Полные пути к сохраненным файлам (в порядке report_types)
+    """
+    report_data = build_report_model(issues, url, profile=profile, meta=meta)
+    return write_reports(report_data, report_types, output_path, filename, compress=compress)
+
+
+def write_reports(report_data: dict, report_types: Union[str, Iterable[str]],
+                  output_path: Optional[str] = None,
+                  filename: Optional[str] = None,
+                  compress: bool = False) -> List[str]:
+    """
+    Отрисовывает модель отчёта в каждом формате и сохраняет в файлы
+
+    Расширение имени файла заменяется на формат отчёта, если форматов
+    несколько или расширение не указано
+
+    :param report_data: Модель отчёта (см. build_report_model)
+    :param report_types: Типы отчетов ('json', 'html') или один тип
+    :param output_path: Путь для сохранения (по умолчанию текущая директория)
+    :param filename: Имя файла (автогенерируется если не указано)
+    :param compress: Сжимать файлы gzip (к имени добавляется .gz)
+    :return: Полные пути к сохраненным файлам (в порядке report_types)
+    """
+    report_types = [report_types] if isinstance(report_types, str) else list(report_types)
+    if not report_types or any(report_type not in ['json', 'html'] for report_type in report_types):
         raise ValueError("Сохранение поддерживается только для форматов: json, html")
 
     if output_path is None:
@@ -31,20 +80,33 @@ def save_report_to_file(issues, url: str, report_type: str,
 
     if filename:
         filename = Path(filename).name
-        full_path = os.path.join(output_path, filename)
     else:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        domain = _extract_domain(url)
-        ext = report_type
-        filename = f"accessibility_report_{domain}_{timestamp}.{ext}"
-        full_path = os.path.join(output_path, filename)
+        domain = _extract_domain(report_data['url'])
+        filename = f"accessibility_report_{domain}_{timestamp}"
 
-    report_content = make_report(issues, url, report_type)
+    paths = []
+    for report_type in report_types:
+        name = filename
+        if len(report_types) > 1 or not Path(filename).suffix:
+            name = str(Path(filename).with_suffix(f".{report_type}"))
+        if compress and not name.endswith('.gz'):
+            name += '.gz'
+        full_path = os.path.join(output_path, name)
 
-    with open(full_path, 'w', encoding='utf-8') as f:
-        f.write(report_content)
+        if compress:
+            f = gzip.open(full_path, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            f = open(full_path, 'w', encoding='utf-8')
+        with f:
+            if report_type == 'json':
+                from .json import write_json_report
+                write_json_report(report_data, f)
+            else:
+                f.write(render_report(report_data, report_type))
+        paths.append(full_path)
 
-    return full_path
+    return paths
 
 
 def _extract_domain(url: str) -> str:
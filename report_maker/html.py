@@ -1,33 +1,79 @@
+import json
 import os
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from functools import lru_cache
+from typing import Optional
+from jinja2 import Environment, FileSystemLoader, ModuleLoader, Template, select_autoescape
+from markupsafe import Markup
 
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_NAME = "report_template.html"
 
-def generate_html_report(report_data: dict) -> str:
+# Каталог шаблонов, скомпилированных в модули Python при сборке (см. compile_templates);
+# если его нет, шаблон компилируется из report_template.html при первом отчёте
+COMPILED_DIR = os.path.join(TEMPLATE_DIR, "compiled")
+
+
+def generate_html_report(report_data: dict, environment: Optional[Environment] = None) -> str:
     """
     Генерирует HTML отчет
 
     :param report_data: Данные для отчета
+    :param environment: Окружение Jinja с шаблоном отчёта (по умолчанию общее, см. get_environment)
     :return: HTML строка с отчетом
     """
-    template_dir = os.path.dirname(os.path.abspath(__file__))
-    template_path = os.path.join(template_dir, "report_template.html")
+    if environment is None:
+        template = _get_template()
+    else:
+        template = environment.get_template(TEMPLATE_NAME)
 
-    env = Environment(
-        loader=FileSystemLoader(template_dir),
-        autoescape=select_autoescape(['html', 'xml'])
+    template_data = _prepare_template_data(report_data)
+
+    return template.render(**template_data)
+
+
+@lru_cache(maxsize=None)
+def get_environment() -> Environment:
+    """
+    Общее окружение Jinja для HTML-отчётов
+
+    Создаётся один раз на процесс; при наличии скомпилированных шаблонов
+    загружает их вместо разбора report_template.html
+    """
+    if os.path.isdir(COMPILED_DIR):
+        loader = ModuleLoader(COMPILED_DIR)
+    else:
+        loader = FileSystemLoader(TEMPLATE_DIR)
+
+    return Environment(
+        loader=loader,
+        autoescape=select_autoescape(['html', 'xml']),
+        auto_reload=False
     )
 
-    template = env.get_template("report_template.html")
 
-    template_data = _prepare_template_data(report_data)
+@lru_cache(maxsize=None)
+def _get_template() -> Template:
+    """Шаблон отчёта из общего окружения (компилируется один раз на процесс)"""
+    return get_environment().get_template(TEMPLATE_NAME)
 
-    return template.render(**template_data)
+
+def compile_templates(target: str) -> None:
+    """
+    Компилирует шаблоны отчётов в модули Python (для сборки, см. accessibility-checker.spec)
+
+    :param target: Каталог для скомпилированных модулей
+    """
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html', 'xml'])
+    )
+    env.compile_templates(target, extensions=["html"], zip=None, ignore_errors=False)
 
 
 def _prepare_template_data(report_data: dict) -> dict:
     """Подготавливает данные для шаблона"""
-    level_summary = _get_level_summary(report_data["issues"])
+    level_summary = report_data["summary"]["by_level"]
 
     return {
         'url': report_data['url'],
@@ -36,18 +82,60 @@ def _prepare_template_data(report_data: dict) -> dict:
         'level_a_count': level_summary.get('A', 0),
         'level_aa_count': level_summary.get('AA', 0),
         'level_aaa_count': level_summary.get('AAA', 0),
-        'issues': report_data['issues']
+        'issues': report_data['issues'],
+        'criteria': sorted(report_data["summary"]["by_criterion"], key=_criterion_key),
+        'issues_data': _issues_data(report_data['issues']),
+        'profile': _prepare_profile(report_data.get('profile')),
+        'fetched_via': report_data.get('fetch_description')
     }
 
 
-def _get_level_summary(grouped_issues: list) -> dict:
-    """Создает сводку по уровням критичности"""
-    summary = {"A": 0, "AA": 0, "AAA": 0}
-    for group in grouped_issues:
-        level = group["level"]
-        if level in summary:
-            summary[level] += group["count"]
-    return summary
+def _issues_data(grouped_issues: list) -> str:
+    """
+    Упаковывает нарушения групп в JSON для встраивания в отчёт
+
+    Повторяющиеся элементы, описания и рекомендации хранятся один раз в таблице
+    strings, а нарушение - списком [элемент, строка, описание, рекомендация]
+    из индексов строк и номера строки; groups следуют в порядке групп отчёта
+    """
+    strings = {}
+
+    def index(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    groups = [
+        [[index(issue['element']), issue['line'], index(issue['message']), index(issue['recommendation'])]
+         for issue in group['issues']]
+        for group in grouped_issues
+    ]
+    data = json.dumps({'strings': list(strings), 'groups': groups}, ensure_ascii=False, separators=(',', ':'))
+    # Внутри <script> нельзя допустить закрывающий тег и разметку
+    return Markup(data.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026'))
+
+
+def _criterion_key(criterion: str) -> tuple:
+    """Ключ сортировки критериев WCAG по номерам (1.4.3 < 1.4.10)"""
+    return tuple(int(part) if part.isdigit() else 0 for part in criterion.split('.'))
+
+
+def _prepare_profile(profile) -> list:
+    """Подготавливает замеры профилирования: этапы, затем правила по убыванию времени"""
+    if not profile:
+        return []
+
+    stages = [r for r in profile if r['kind'] == 'stage']
+    rules = sorted((r for r in profile if r['kind'] == 'rule'), key=lambda r: r['wall'], reverse=True)
+
+    return [
+        {
+            'name': r['name'],
+            'kind': r['kind'],
+            'wall_ms': f"{r['wall'] * 1000:.1f}",
+            'cpu_ms': f"{r['cpu'] * 1000:.1f}",
+            'memory_kb': f"{r['peak_memory'] / 1024:.1f}" if r['peak_memory'] is not None else '-'
+        }
+        for r in stages + rules
+    ]
 
 
 def _format_timestamp(timestamp: str) -> str:
@@ -1,4 +1,5 @@
 import json
+from typing import TextIO
 
 
 def generate_json_report(report_data: dict) -> str:
@@ -8,38 +9,33 @@ def generate_json_report(report_data: dict) -> str:
     :param report_data: Данные для отчета
     :return: JSON строка с отчетом
     """
+    return json.dumps(_json_report(report_data), ensure_ascii=False, indent=2)
+
+
+def write_json_report(report_data: dict, stream: TextIO) -> None:
+    """
+    Записывает JSON отчет в поток по частям, не собирая его в одну строку
+
+    :param report_data: Данные для отчета
+    :param stream: Открытый на запись текстовый поток
+    """
+    json.dump(_json_report(report_data), stream, ensure_ascii=False, indent=2)
+
+
+def _json_report(report_data: dict) -> dict:
+    """Структура JSON отчета"""
     json_report = {
         "report_info": {
             "url": report_data["url"],
             "timestamp": report_data["timestamp"],
-            "total_issues": report_data["total_issues"]
-        },
-        "summary": {
-            "by_level": _get_issues_summary_by_level(report_data["issues"]),
-            "by_criterion": _get_issues_summary_by_criterion(report_data["issues"])
+            "total_issues": report_data["total_issues"],
+            **report_data.get("meta", {})
         },
+        "summary": report_data["summary"],
         "issues": report_data["issues"]
     }
-    
-    return json.dumps(json_report, ensure_ascii=False, indent=2)
-
-
-def _get_issues_summary_by_level(grouped_issues: list) -> dict:
-    """Создает сводку по уровням критичности"""
-    summary = {"A": 0, "AA": 0, "AAA": 0}
-    for group in grouped_issues:
-        level = group["level"]
-        if level in summary:
-            summary[level] += group["count"]
-    return summary
-
-
-def _get_issues_summary_by_criterion(grouped_issues: list) -> dict:
-    """Создает сводку по критериям WCAG"""
-    summary = {}
-    for group in grouped_issues:
-        criterion = group["criterion"]
-        if criterion not in summary:
-            summary[criterion] = 0
-        summary[criterion] += group["count"]
-    return summary
+
+    if report_data.get("profile"):
+        json_report["profile"] = report_data["profile"]
+
+    return json_report
@@ -1,26 +1,74 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from rules.base import Issue
 
 
-def make_report(issues: List[Issue], url: str, report_type: str = 'console') -> str:
+# Уровни WCAG в порядке вывода (от самых строгих)
+LEVEL_PRIORITY = {'AAA': 3, 'AA': 2, 'A': 1}
+
+# Форматы отчётов
+REPORT_TYPES = ('console', 'json', 'html')
+
+
+def build_report_model(issues: List[Issue], url: str, profile: Optional[List[dict]] = None,
+                       meta: Optional[dict] = None) -> dict:
     """
-    Генерирует отчет о проблемах доступности в зависимости от типа
+    Собирает модель отчёта, из которой отрисовываются все форматы
+
+    Нарушения группируются за один проход, группы сортируются один раз
 
     :param issues: Список найденных нарушений
     :param url: URL проверенной страницы
-    :param report_type: Тип отчета ('console', 'json', 'html')
-    :return: Сгенерированный отчет в виде строки (для pdf - путь к файлу)
+    :param profile: Замеры времени и памяти по этапам и правилам (см. profiling.Profiler)
+    :param meta: Сведения о загрузке страницы (fetched_via - способ загрузки, fallback_reason - причина перехода на браузер)
+    :return: Словарь с ключами url, timestamp, total_issues, issues (группы нарушений),
+        summary (by_level, by_criterion), profile, meta, fetch_description (описание способа
+        загрузки для отчётов или None)
     """
     grouped_issues = _group_and_sort_issues(issues)
 
-    report_data = {
+    by_level = {'A': 0, 'AA': 0, 'AAA': 0}
+    by_criterion = {}
+    for group in grouped_issues:
+        if group['level'] in by_level:
+            by_level[group['level']] += group['count']
+        by_criterion[group['criterion']] = by_criterion.get(group['criterion'], 0) + group['count']
+
+    return {
         'url': url,
         'timestamp': datetime.now().isoformat(),
         'total_issues': len(issues),
-        'issues': grouped_issues
+        'issues': grouped_issues,
+        'summary': {'by_level': by_level, 'by_criterion': by_criterion},
+        'profile': profile,
+        'meta': meta or {},
+        'fetch_description': _describe_fetch(meta or {})
     }
 
+
+def _describe_fetch(meta: dict) -> Optional[str]:
+    """Описывает способ загрузки страницы (None, если он неизвестен)"""
+    if not meta.get('fetched_via'):
+        return None
+    if meta['fetched_via'] == 'http':
+        return 'HTTP (без браузера)'
+    if meta['fetched_via'] == 'file':
+        return 'локальный файл'
+    if meta['fetched_via'] == 'snapshot':
+        return 'сохранённый снимок страницы'
+    if meta.get('fallback_reason'):
+        return f"браузер ({meta['fallback_reason']})"
+    return 'браузер'
+
+
+def render_report(report_data: dict, report_type: str = 'console') -> str:
+    """
+    Отрисовывает модель отчёта в заданном формате
+
+    :param report_data: Модель отчёта (см. build_report_model)
+    :param report_type: Тип отчета ('console', 'json', 'html')
+    :return: Сгенерированный отчет в виде строки
+    """
     if report_type == 'console':
         from .console import generate_console_report
         return generate_console_report(report_data)
@@ -34,37 +82,49 @@ def make_report(issues: List[Issue], url: str, report_type: str = 'console') ->
         raise ValueError(f"Неподдерживаемый тип отчета: {report_type}")
 
 
+def make_report(issues: List[Issue], url: str, report_type: str = 'console',
+                profile: Optional[List[dict]] = None, meta: Optional[dict] = None) -> str:
+    """
+    Генерирует отчет о проблемах доступности в зависимости от типа
+
+    :param issues: Список найденных нарушений
+    :param url: URL проверенной страницы
+    :param report_type: Тип отчета ('console', 'json', 'html')
+    :param profile: Замеры времени и памяти по этапам и правилам (см. profiling.Profiler)
+    :param meta: Сведения о загрузке страницы (fetched_via - способ загрузки, fallback_reason - причина перехода на браузер)
+    :return: Сгенерированный отчет в виде строки
+    """
+    return render_report(build_report_model(issues, url, profile=profile, meta=meta), report_type)
+
+
 def _group_and_sort_issues(issues: List[Issue]) -> List:
     """
     Группирует и сортирует нарушения по критичности и типу
 
+    Группы следуют в порядке убывания уровня, а при равном уровне - в порядке
+    первого нарушения; нарушения внутри группы сохраняют исходный порядок
+
     :param issues: Список нарушений
     :return: Отсортированный и сгруппированный список нарушений
     """
-    level_priority = {'AAA': 3, 'AA': 2, 'A': 1}
-
-    sorted_issues = sorted(issues, key=lambda x: level_priority.get(x.level, 0), reverse=True)
-
     groups = {}
-    for issue in sorted_issues:
+    for issue in issues:
         key = (issue.name, issue.criterion, issue.level)
-        if key not in groups:
-            groups[key] = {
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
                 'name': issue.name,
                 'criterion': issue.criterion,
                 'level': issue.level,
                 'count': 0,
                 'issues': []
             }
-        groups[key]['count'] += 1
-        groups[key]['issues'].append({
+        group['count'] += 1
+        group['issues'].append({
             'element': issue.element,
             'line': issue.line,
             'message': issue.message,
             'recommendation': issue.recommendation
         })
 
-    grouped_list = list(groups.values())
-    grouped_list.sort(key=lambda x: level_priority.get(x['level'], 0), reverse=True)
-    
-    return grouped_list
+    return sorted(groups.values(), key=lambda x: LEVEL_PRIORITY.get(x['level'], 0), reverse=True)
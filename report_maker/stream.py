@@ -0,0 +1,170 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from rules.base import Issue
+
+# Форматы потокового файла нарушений
+STREAM_FORMATS = ('ndjson', 'json')
+
+
+class IssueStreamWriter(ABC):
+    """
+    Потоковая запись нарушений нескольких страниц в один файл
+
+    Нарушения записываются по мере проверки страниц и в памяти не накапливаются:
+    хранятся только счётчики для итоговой сводки, которая записывается в конце
+    файла при закрытии. Используется как контекстный менеджер
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: путь к файлу (перезаписывается)
+        """
+        self.path = path
+        self.total_pages = 0
+        self.failed_pages = 0
+        self.total_issues = 0
+        self.by_level: Dict[str, int] = {'A': 0, 'AA': 0, 'AAA': 0}
+        self.by_criterion: Dict[str, int] = {}
+        self._file = open(path, 'w', encoding='utf-8')
+        self._start()
+
+    def __enter__(self) -> "IssueStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def write_page(self, entry: dict, issues: Optional[List[Issue]]) -> None:
+        """
+        Записать нарушения страницы
+
+        :param entry: запись сводки страницы (url, final_url, error, ...)
+        :param issues: нарушения страницы (None, если страницу не удалось проверить)
+        """
+        self.total_pages += 1
+        if issues is None:
+            self.failed_pages += 1
+            issues = []
+
+        url = entry.get('final_url') or entry['url']
+        for issue in issues:
+            self.total_issues += 1
+            if issue.level in self.by_level:
+                self.by_level[issue.level] += 1
+            self.by_criterion[issue.criterion] = self.by_criterion.get(issue.criterion, 0) + 1
+            self._write_issue({
+                'url': url,
+                'name': issue.name,
+                'criterion': issue.criterion,
+                'level': issue.level,
+                'element': issue.element,
+                'line': issue.line,
+                'message': issue.message,
+                'recommendation': issue.recommendation
+            })
+        self._write_page(entry, len(issues))
+        self._file.flush()
+
+    def summary(self) -> dict:
+        """
+        Итоговая сводка по записанным страницам
+        """
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'total_pages': self.total_pages,
+            'failed_pages': self.failed_pages,
+            'total_issues': self.total_issues,
+            'by_level': self.by_level,
+            'by_criterion': self.by_criterion
+        }
+
+    def close(self) -> None:
+        """
+        Записать сводку и закрыть файл
+        """
+        if self._file.closed:
+            return
+        try:
+            self._finish()
+        finally:
+            self._file.close()
+
+    def _start(self) -> None:
+        """Начало файла"""
+
+    @abstractmethod
+    def _write_issue(self, record: dict) -> None:
+        """Запись нарушения"""
+        pass
+
+    def _write_page(self, entry: dict, issues: int) -> None:
+        """Запись о странице после её нарушений"""
+
+    @abstractmethod
+    def _finish(self) -> None:
+        """Конец файла со сводкой"""
+        pass
+
+
+class NdjsonIssueWriter(IssueStreamWriter):
+    """
+    NDJSON: по объекту JSON в строке - нарушения страницы (type: issue), затем
+    запись о странице (type: page); последняя строка - сводка (type: summary)
+    """
+
+    def _write_issue(self, record: dict) -> None:
+        self._write_line({'type': 'issue', **record})
+
+    def _write_page(self, entry: dict, issues: int) -> None:
+        self._write_line({'type': 'page', 'url': entry['url'], 'final_url': entry.get('final_url'),
+                          'issues': issues, 'error': entry.get('error')})
+
+    def _finish(self) -> None:
+        self._write_line({'type': 'summary', **self.summary()})
+
+    def _write_line(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write('\n')
+
+
+class JsonIssueWriter(IssueStreamWriter):
+    """
+    JSON-объект с массивом issues (по нарушению в строке) и сводкой summary в конце
+    """
+
+    def _start(self) -> None:
+        self._file.write('{\n"issues": [')
+        self._first = True
+
+    def _write_issue(self, record: dict) -> None:
+        self._file.write('\n' if self._first else ',\n')
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._first = False
+
+    def _finish(self) -> None:
+        self._file.write('\n],\n"summary": ')
+        self._file.write(json.dumps(self.summary(), ensure_ascii=False, indent=2))
+        self._file.write('\n}\n')
+
+
+def open_issue_stream(output_dir: str, stream_format: str = 'ndjson') -> IssueStreamWriter:
+    """
+    Открыть потоковый файл нарушений issues.<формат> в каталоге
+
+    :param output_dir: каталог
+    :param stream_format: формат (см. STREAM_FORMATS)
+    :return: открытый писатель
+    """
+    if stream_format == 'ndjson':
+        writer_class = NdjsonIssueWriter
+    elif stream_format == 'json':
+        writer_class = JsonIssueWriter
+    else:
+        raise ValueError(f"Неподдерживаемый формат потока: {stream_format}. Доступны: {', '.join(STREAM_FORMATS)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    return writer_class(os.path.join(output_dir, f"issues.{stream_format}"))
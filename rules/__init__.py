@@ -1,16 +1,7 @@
-import importlib
-from pathlib import Path
+from .base import WCAGRule, ElementRule, Issue, RuleError
+from .document import Document, PARSERS
+from .manifest import RULE_MANIFEST, LEVELS
 
-from .base import WCAGRule, Issue
+# Модули правил импортируются лениво по манифесту (см. WCAGRule.select_rules)
 
-rules_dir = Path(__file__).parent
-
-for file in rules_dir.glob("*.py"):
-    if file.name not in ["__init__.py", "base.py"]:
-        module_name = file.stem
-        try:
-            importlib.import_module(f"rules.{module_name}")
-        except Exception as e:
-            print(f"Предупреждение: не удалось загрузить правило {module_name}: {e}")
-
-__all__ = ["WCAGRule", "Issue"]
\ No newline at end of file
+__all__ = ["WCAGRule", "ElementRule", "Issue", "RuleError", "Document", "PARSERS", "RULE_MANIFEST", "LEVELS"]
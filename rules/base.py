@@ -1,8 +1,14 @@
+import itertools
+import time
 from abc import ABC, abstractmethod
-from typing import List, ClassVar
-from bs4 import BeautifulSoup
+from typing import List, ClassVar, Optional, Union, FrozenSet, Dict, Iterable
+from bs4 import BeautifulSoup, Tag
 from dataclasses import dataclass
 
+from .document import Document
+from .manifest import select_specs, load_rules, rule_matches, rule_names
+from profiling import Profiler, profiled
+
 
 @dataclass
 class Issue:
@@ -18,6 +24,31 @@ class Issue:
     recommendation: str  # Рекомендация по исправлению
 
 
+@dataclass
+class RuleError:
+    """
+    Ошибка при выполнении правила (нарушения правила для страницы не получены)
+    """
+    name: str  # Название правила
+    criterion: str  # Критерий WCAG
+    level: str  # Уровень WCAG
+    error: str  # Тип и текст исключения
+
+
+def _rule_failed(rule, e: Exception, errors: Optional[List[RuleError]]) -> None:
+    """
+    Учесть ошибку правила: добавить её в errors или, если список не передан, вывести
+
+    :param rule: класс или экземпляр правила
+    :param e: исключение
+    :param errors: список для ошибок правил
+    """
+    if errors is None:
+        print(f"Ошибка в {rule.name}: {e}")
+    else:
+        errors.append(RuleError(rule.name, rule.criterion, rule.level, f"{type(e).__name__}: {e}"))
+
+
 class WCAGRule(ABC):
     """
     Абстрактный класс для правил WCAG
@@ -25,42 +56,173 @@ class WCAGRule(ABC):
     name: str = ""
     criterion: str = ""
     level: str = ""
+    # Версия правила: увеличивается при изменении логики, чтобы сбросить кэш его результатов
+    version: str = "1"
+
+    # Бюджет сериализации элемента в Issue.element: крупные элементы сокращаются
+    # до открывающего тега с многоточием
+    element_max_lines: ClassVar[int] = 50
+    element_max_chars: ClassVar[int] = 5000
 
     # Список классов-наследников WCAGRule
     _registry: ClassVar[List[type["WCAGRule"]]] = []
 
-    def __init_subclass__(cls, **kwargs):
+    def __init_subclass__(cls, register: bool = True, **kwargs):
         super().__init_subclass__(**kwargs)
-        if cls.__name__ != "WCAGRule":
+        if register:
             WCAGRule._registry.append(cls)
 
+    def __init__(self, document: Optional[Document] = None):
+        """
+        :param document: разобранная страница, общая для всех правил (если есть)
+        """
+        self.document = document
+
     @classmethod
     def get_all_rules(cls) -> List[type["WCAGRule"]]:
         """
         Получить список всех правил WCAG
         """
-        return cls._registry
+        return cls.select_rules()
 
     @classmethod
-    def run_all(cls, html: str) -> list[Issue]:
+    def select_rules(cls, levels: Optional[Iterable[str]] = None,
+                     criteria: Optional[Iterable[str]] = None,
+                     exclude: Optional[Iterable[str]] = None) -> List[type["WCAGRule"]]:
+        """
+        Отобрать правила по уровню, критерию и имени
+
+        Встроенные правила отбираются по манифесту, и импортируются только модули
+        отобранных правил. Правила, зарегистрированные вне манифеста, фильтруются
+        по атрибутам класса и добавляются в конец
+
+        :param levels: допустимые уровни WCAG (None - любые)
+        :param criteria: допустимые критерии WCAG (None - любые)
+        :param exclude: исключённые правила (имя модуля или класса, без учёта регистра)
+        :return: классы правил
+        :raises ValueError: при неизвестном уровне, критерии или имени правила
+        """
+        levels = set(levels) if levels is not None else None
+        criteria = set(criteria) if criteria is not None else None
+        exclude = set(exclude) if exclude is not None else None
+
+        if exclude:
+            known = rule_names()
+            for rule in cls._registry:
+                known.update((rule.__module__.rsplit('.', 1)[-1].lower(), rule.__name__.lower()))
+            unknown = sorted(name for name in exclude if name.lower() not in known)
+            if unknown:
+                raise ValueError(f"Неизвестные правила: {', '.join(unknown)}. Укажите имя модуля или класса правила")
+
+        extra_criteria = {rule.criterion for rule in cls._registry}
+        rules = load_rules(select_specs(levels, criteria, exclude, extra_criteria))
+        for rule in cls._registry:
+            module = rule.__module__.rsplit('.', 1)[-1]
+            if rule not in rules and rule_matches(module, rule.__name__, rule.criterion, rule.level,
+                                                  levels, criteria, exclude):
+                rules.append(rule)
+
+        return rules
+
+    @classmethod
+    def run_all(cls, html: Union[str, Document], single_pass: bool = True,
+                parser: str = 'html.parser', profiler: Optional[Profiler] = None,
+                rules: Optional[List[type["WCAGRule"]]] = None,
+                workers: Optional[int] = None, cache=None,
+                errors: Optional[List[RuleError]] = None) -> list[Issue]:
         """
         Проверить страницу по всем зарегистрированным правилам
 
-        :param html: HTML-контент страницы
+        Страница разбирается один раз, и документ передаётся каждому правилу.
+        В однопроходном режиме правила-наследники ElementRule получают элементы
+        из одного общего обхода дерева, остальные правила выполняют check()
+
+        :param html: HTML-контент страницы или уже разобранный документ
+        :param single_pass: использовать общий обход дерева для ElementRule
+        :param parser: парсер для построения дерева (см. rules.document.PARSERS)
+        :param profiler: профилировщик для замеров разбора и каждого правила
+        :param rules: правила для проверки (по умолчанию все, см. select_rules)
+        :param workers: число процессов для параллельной проверки (None или 1 - последовательно)
+        :param cache: кэш результатов (rules.cache.ResultCache); правила, чьи результаты
+            для этой страницы уже есть в кэше, не выполняются, а страница не разбирается
+        :param errors: список, в который добавляются ошибки правил (без него ошибки выводятся)
         :return: список всех найденных нарушений
         """
+        if rules is None:
+            rules = cls.get_all_rules()
+        document = html if isinstance(html, Document) else Document(html, parser)
+
+        cached = {}
+        if cache is not None:
+            with profiled(profiler, 'cache lookup'):
+                page_key = cache.page_key(document)
+                rule_keys = [cache.rule_key(rule) for rule in rules]
+                cached = cache.get(page_key, rule_keys)
+
+        missing = [rule for rule in rules if cache is None or cache.rule_key(rule) not in cached]
+        if not missing:
+            results = []
+        elif workers and workers > 1 and len(missing) > 1:
+            from .parallel import run_parallel
+            results = run_parallel(document, missing, workers, single_pass, profiler, errors)
+        else:
+            results = cls.run_rules(document, missing, single_pass, profiler, errors)
+
+        if cache is None:
+            return [issue for issues in results if issues for issue in issues]
+
+        # Правила, завершившиеся с ошибкой, в кэш не попадают
+        computed = {cache.rule_key(rule): issues for rule, issues in zip(missing, results) if issues is not None}
+        cache.put(page_key, computed)
+
         all_issues = []
-        rules = cls.get_all_rules()
+        for key in rule_keys:
+            all_issues.extend(cached.get(key) or computed.get(key) or [])
+        return all_issues
+
+    @classmethod
+    def run_rules(cls, document: Document, rules: List[type["WCAGRule"]], single_pass: bool = True,
+                  profiler: Optional[Profiler] = None,
+                  errors: Optional[List[RuleError]] = None) -> List[Optional[List[Issue]]]:
+        """
+        Выполнить правила над документом в текущем процессе
+
+        :param document: разобранная страница
+        :param rules: классы правил
+        :param single_pass: использовать общий обход дерева для ElementRule
+        :param profiler: профилировщик для замеров разбора и каждого правила
+        :param errors: список, в который добавляются ошибки правил (без него ошибки выводятся)
+        :return: нарушения каждого правила в порядке rules (None при ошибке в правиле)
+        """
+        with profiled(profiler, 'parse'):
+            document.soup
 
-        for rule in rules:
+        results: List[Optional[List[Issue]]] = [None for _ in rules]
+        instances = {}
+        for index, rule in enumerate(rules):
             try:
-                instance = rule()
-                issues = instance.check(html=html)
-                all_issues.extend(issues)
+                instances[index] = rule(document)
             except Exception as e:
-                print(f"Ошибка в {rule.name}: {e}")
+                _rule_failed(rule, e, errors)
 
-        return all_issues
+        element_rules = {i: r for i, r in instances.items() if isinstance(r, ElementRule)} if single_pass else {}
+        with profiled(profiler, 'walk'):
+            walked = ElementRule.walk(document, list(element_rules.values()), profiler, errors)
+
+        for index, issues in zip(element_rules, walked):
+            results[index] = issues
+
+        for index, instance in instances.items():
+            if index in element_rules:
+                continue
+
+            try:
+                with profiled(profiler, instance.name, 'rule'):
+                    results[index] = instance.check(html=document.html)
+            except Exception as e:
+                _rule_failed(instance, e, errors)
+
+        return results
 
     @abstractmethod
     def check(self, html: str) -> List[Issue]:
@@ -72,15 +234,46 @@ class WCAGRule(ABC):
         """
         pass
 
-    def _parse(self, html: str) -> BeautifulSoup:
+    def _parse(self, html: Union[str, Document]) -> BeautifulSoup:
         """
         Спарсить HTML-контент
 
+        Если передан HTML общего документа (или сам документ), возвращается уже
+        построенное дерево, иначе страница разбирается заново
+
         :param html: HTML-контент
         """
-        return BeautifulSoup(html, 'html.parser')
+        document = self._document_for(html)
+        if document is not None:
+            return document.soup
+        return Document(html, self.document.parser if self.document else 'html.parser').soup
 
-    def _get_line(self, html: str, element) -> int:
+    def _document_for(self, html: Union[str, Document]) -> Optional[Document]:
+        """
+        Найти общий документ, соответствующий переданному HTML
+
+        :param html: HTML-контент или документ
+        :return: документ или None, если HTML не относится к общему документу
+        """
+        if isinstance(html, Document):
+            return html
+        if self.document is not None and html is self.document.html:
+            return self.document
+        return None
+
+    def _get_line(self, html: Union[str, Document], element) -> int:
+        """
+        Определить номер строки элемента в исходном HTML
+
+        Для lxml номера строк переносятся в дерево общего документа при первом
+        обращении. Если парсер не сохранил номер строки, элемент ищется в тексте страницы по
+        значениям атрибутов и тексту, начиная с позиции ближайшего предка с известной
+        строкой; позиция переводится в номер строки через общий индекс строк документа
+
+        :param html: HTML-контент страницы или документ
+        :param element: HTML-элемент BeautifulSoup
+        :return: номер строки (0, если определить не удалось)
+        """
         if not element:
             return 0
 
@@ -91,6 +284,15 @@ class WCAGRule(ABC):
         if not html:
             return 0
 
+        document = self._document_for(html)
+        if document is not None and document.restore_source_lines():
+            line = getattr(element, 'sourceline', None)
+            if line:
+                return line
+        document = document or Document(html)
+        html_lower = document.html_lower
+        line_index = document.line_index
+
         candidates = []
         for attr in ('href', 'src', 'id', 'name', 'aria-label', 'title'):
             value = element.get(attr)
@@ -101,16 +303,54 @@ class WCAGRule(ABC):
         if text and len(text) > 3:
             candidates.append(text)
 
-        html_lower = html.lower()
+        start = 0
+        for parent in element.parents:
+            parent_line = getattr(parent, 'sourceline', None)
+            if parent_line:
+                start = line_index.offset(parent_line)
+                break
+
         for cand in candidates:
             if cand:
-                pos = html_lower.find(str(cand).lower())
+                cand_lower = str(cand).lower()
+                pos = html_lower.find(cand_lower, start)
+                if pos == -1 and start:
+                    pos = html_lower.find(cand_lower, 0, start + len(cand_lower))
                 if pos != -1:
-                    return html.count('\n', 0, pos) + 1
+                    return line_index.line(pos)
 
         return 0
 
-    def _issue(self, element, message: str, recommendation: str, html: str = "") -> Issue:
+    def _fits_budget(self, element) -> bool:
+        """
+        Проверить, укладывается ли сериализация элемента в бюджет строк и символов
+
+        Размер оценивается обходом поддерева с остановкой при превышении бюджета,
+        поэтому крупные поддеревья не сериализуются целиком
+
+        :param element: HTML-элемент BeautifulSoup
+        :return: True, если элемент можно вывести полностью
+        """
+        max_chars, max_lines = self.element_max_chars, self.element_max_lines
+        chars = lines = 0
+
+        for node in itertools.chain((element,), element.descendants):
+            if isinstance(node, Tag):
+                chars += 2 * len(node.name) + 5
+                for k, v in node.attrs.items():
+                    v = ' '.join(v) if isinstance(v, list) else str(v)
+                    chars += len(k) + len(v) + 4
+                    lines += v.count('\n')
+            else:
+                chars += len(node)
+                lines += node.count('\n')
+
+            if chars > max_chars or lines > max_lines:
+                return False
+
+        return True
+
+    def _issue(self, element, message: str, recommendation: str, html: Union[str, Document] = "") -> Issue:
         """
         Создать объект Issue для найденного нарушения
 
@@ -121,9 +361,9 @@ class WCAGRule(ABC):
         :return: объект Issue
         """
         if hasattr(element, 'name'):
-            element_str = str(element)
-
-            if element_str.count('\n') > 50:
+            if self._fits_budget(element):
+                element_repr = str(element)
+            else:
                 attrs_parts = []
                 for k, v in element.attrs.items():
                     if isinstance(v, list):
@@ -131,10 +371,8 @@ class WCAGRule(ABC):
                     v = str(v).replace('"', '&quot;')
                     attrs_parts.append(f'{k}="{v}"')
 
-                attrs_str = ' '.join(attrs_parts)
+                attrs_str = ' '.join(attrs_parts)[:self.element_max_chars]
                 element_repr = f"<{element.name} {attrs_str}>..."
-            else:
-                element_repr = element_str
         else:
             element_repr = 'unknown'
 
@@ -147,3 +385,149 @@ class WCAGRule(ABC):
             message=message,
             recommendation=recommendation
         )
+
+
+class ElementRule(WCAGRule, register=False):
+    """
+    Правило, проверяющее отдельные элементы страницы
+
+    Наследник объявляет интересующие его теги (tags) и атрибуты (attributes) и
+    реализует visit(); движок передаёт ему подходящие элементы в порядке документа.
+    Проверки, требующие всего документа, выполняются в finalize()
+    """
+    tags: ClassVar[FrozenSet[str]] = frozenset()
+    attributes: ClassVar[FrozenSet[str]] = frozenset()
+
+    def check(self, html: str) -> List[Issue]:
+        """
+        Проверить страницу отдельным обходом дерева (без общего прохода)
+
+        :param html: HTML-контент страницы
+        :return: список найденных нарушений
+        """
+        issues = []
+        self.begin()
+
+        for element in self._parse(html).find_all(True):
+            if element.name in self.tags or not self.attributes.isdisjoint(element.attrs):
+                issues.extend(self.visit(element, html))
+
+        issues.extend(self.finalize(html))
+        return issues
+
+    def begin(self) -> None:
+        """
+        Сбросить состояние правила перед обходом страницы
+        """
+        pass
+
+    @abstractmethod
+    def visit(self, element: Tag, html: str) -> List[Issue]:
+        """
+        Проверить элемент с подходящим тегом или атрибутом
+
+        :param element: HTML-элемент BeautifulSoup
+        :param html: HTML-контент страницы
+        :return: список найденных нарушений
+        """
+        pass
+
+    def finalize(self, html: str) -> List[Issue]:
+        """
+        Завершить проверку после обхода всего документа
+
+        :param html: HTML-контент страницы
+        :return: список найденных нарушений
+        """
+        return []
+
+    @staticmethod
+    def walk(document: Document, rules: List["ElementRule"],
+             profiler: Optional[Profiler] = None,
+             errors: Optional[List[RuleError]] = None) -> List[Optional[List[Issue]]]:
+        """
+        Обойти дерево документа один раз, передавая элементы подписанным правилам
+
+        Правило, выбросившее исключение, исключается из обхода, а его нарушения
+        отбрасываются (как при ошибке в check())
+
+        :param document: разобранная страница
+        :param rules: экземпляры правил
+        :param profiler: профилировщик; время visit() и finalize() суммируется по правилам,
+            а пиковой памятью правила считается наибольший пик среди его вызовов
+        :param errors: список, в который добавляются ошибки правил (без него ошибки выводятся)
+        :return: нарушения каждого правила (None для правил, завершившихся с ошибкой)
+        """
+        results: List[Optional[List[Issue]]] = [[] for _ in rules]
+        if not rules:
+            return results
+
+        # Накопленные [реальное, процессорное] время и пиковая память по правилам
+        timings = [[0.0, 0.0, None] for _ in rules] if profiler else None
+
+        def fail(index: int, e: Exception) -> None:
+            results[index] = None
+            _rule_failed(rules[index], e, errors)
+
+        def call(index: int, method, *args) -> List[Issue]:
+            if timings is None:
+                return method(*args)
+            mark = profiler.memory_mark()
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return method(*args)
+            finally:
+                timing = timings[index]
+                timing[0] += time.perf_counter() - wall
+                timing[1] += time.process_time() - cpu
+                peak = profiler.memory_peak(mark)
+                if peak is not None:
+                    timing[2] = max(timing[2] or 0, peak)
+
+        by_tag: Dict[str, List[int]] = {}
+        by_attr: Dict[str, List[int]] = {}
+        for index, rule in enumerate(rules):
+            try:
+                rule.begin()
+            except Exception as e:
+                fail(index, e)
+                continue
+            for tag in rule.tags:
+                by_tag.setdefault(tag, []).append(index)
+            for attr in rule.attributes:
+                by_attr.setdefault(attr, []).append(index)
+
+        html = document.html
+        for element in document.soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+
+            targets = by_tag.get(element.name, ())
+            if by_attr:
+                attr_targets = [i for attr in element.attrs for i in by_attr.get(attr, ())]
+                if attr_targets:
+                    targets = sorted(set(targets).union(attr_targets))
+
+            for index in targets:
+                issues = results[index]
+                if issues is None:
+                    continue
+                try:
+                    issues.extend(call(index, rules[index].visit, element, html))
+                except Exception as e:
+                    fail(index, e)
+
+        for index, rule in enumerate(rules):
+            issues = results[index]
+            if issues is None:
+                continue
+            try:
+                issues.extend(call(index, rule.finalize, html))
+            except Exception as e:
+                fail(index, e)
+
+        if profiler is not None:
+            for rule, (wall, cpu, peak) in zip(rules, timings):
+                profiler.record(rule.name, wall, cpu, peak_memory=peak)
+
+        return results
@@ -1,48 +1,50 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class ButtonAccessibilityRule(WCAGRule):
+class ButtonAccessibilityRule(ElementRule):
     name = "Name, Role, Value"
     criterion = "4.1.2"
     level = "AA"
+    version = "1"
+    tags = frozenset({'button'})
+    attributes = frozenset({'role'})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._role_buttons: List[Issue] = []
+
+    def visit(self, elem, html: str) -> List[Issue]:
         """
         Проверить доступность кнопок
         """
         issues = []
-        soup = self._parse(html)
 
-        for button in soup.find_all('button'):
-            button_text = button.get_text(strip=True)
-            aria_label = button.get('aria-label', '').strip()
-            title = button.get('title', '').strip()
+        if elem.name == 'button':
+            button_text = elem.get_text(strip=True)
+            aria_label = elem.get('aria-label', '').strip()
+            title = elem.get('title', '').strip()
 
             if not button_text and not aria_label and not title:
-                img = button.find('img')
+                img = elem.find('img')
                 if img and img.has_attr('alt') and img['alt'].strip():
-                    continue
+                    return issues
 
-                if button.has_attr('aria-labelledby'):
-                    continue
+                if elem.has_attr('aria-labelledby'):
+                    return issues
 
                 issues.append(self._issue(
-                    button,
+                    elem,
                     'Кнопка не имеет доступного имени',
                     'Добавьте текст внутри кнопки, атрибута aria-label или alt (к изображению)',
                     html
                 ))
 
-        for elem in soup.find_all(attrs={'role': 'button'}):
-            if elem.name == 'button':
-                continue
-
+        elif elem.get('role') == 'button':
             elem_text = elem.get_text(strip=True)
             aria_label = elem.get('aria-label', '').strip()
 
             if not elem_text and not aria_label:
-                issues.append(self._issue(
+                self._role_buttons.append(self._issue(
                     elem,
                     f'Элемент <{elem.name}> с role="button" не имеет доступного имени',
                     'Добавьте текст или aria-label для описания действия',
@@ -50,3 +52,9 @@ class ButtonAccessibilityRule(WCAGRule):
                 ))
 
         return issues
+
+    def finalize(self, html: str) -> List[Issue]:
+        """
+        Вернуть нарушения для элементов с role="button" (после нарушений кнопок)
+        """
+        return self._role_buttons
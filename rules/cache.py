@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Iterable, Optional, Tuple
+
+from .base import Issue
+from .document import Document
+
+
+class ResultCache:
+    """
+    Дисковый кэш результатов проверки, адресуемый содержимым страницы
+
+    Запись хранится в файле на страницу (ключ - хэш HTML и парсера) и содержит
+    нарушения каждого правила под ключом "модуль.Класс@версия", поэтому изменение
+    версии правила делает недействительными только его результаты. При превышении
+    размера удаляются записи, к которым дольше всего не обращались
+    """
+
+    def __init__(self, directory: str, max_size: int = 256 * 1024 * 1024):
+        """
+        :param directory: каталог кэша
+        :param max_size: максимальный суммарный размер записей в байтах
+        """
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def page_key(document: Document) -> str:
+        """
+        Ключ страницы: хэш HTML-контента и парсера
+
+        :param document: страница
+        :return: шестнадцатеричный SHA-256
+        """
+        digest = hashlib.sha256(document.html.encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0' + document.parser.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def rule_key(rule: type) -> str:
+        """
+        Ключ правила: модуль, имя класса и версия
+
+        :param rule: класс правила
+        """
+        return f"{rule.__module__}.{rule.__qualname__}@{rule.version}"
+
+    def get(self, page_key: str, rule_keys: Iterable[str]) -> Dict[str, List[Issue]]:
+        """
+        Получить сохранённые нарушения для страницы
+
+        :param page_key: ключ страницы
+        :param rule_keys: ключи нужных правил
+        :return: нарушения найденных в кэше правил
+        """
+        path = self._path(page_key)
+        entry = self._read(path)
+        if not entry:
+            return {}
+
+        found = {
+            key: [Issue(**issue) for issue in entry[key]]
+            for key in rule_keys if key in entry
+        }
+        if found:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return found
+
+    def put(self, page_key: str, results: Dict[str, List[Issue]]) -> None:
+        """
+        Сохранить нарушения правил для страницы
+
+        Результаты других версий тех же правил удаляются из записи
+
+        :param page_key: ключ страницы
+        :param results: нарушения по ключам правил
+        """
+        if not results:
+            return
+
+        path = self._path(page_key)
+        entry = self._read(path) or {}
+        size = self._current_size() - (self._file_size(path) if entry else 0)
+
+        updated_rules = {key.rsplit('@', 1)[0] for key in results}
+        entry = {key: value for key, value in entry.items() if key.rsplit('@', 1)[0] not in updated_rules}
+        entry.update({key: [asdict(issue) for issue in issues] for key, issues in results.items()})
+
+        # Уникальный временный файл: запись могут одновременно обновлять несколько процессов
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._size = size + self._file_size(path)
+        if self._size > self.max_size:
+            self._evict()
+
+    def _path(self, page_key: str) -> Path:
+        """Путь к файлу записи страницы"""
+        return self.directory / page_key[:2] / f"{page_key}.json"
+
+    @staticmethod
+    def _read(path: Path) -> Optional[dict]:
+        """Прочитать запись (None, если её нет или она повреждена)"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        """Размер файла записи (0, если её уже удалил другой процесс)"""
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _entries(self) -> List[Tuple[Path, os.stat_result]]:
+        """Файлы записей и их атрибуты (записи, удалённые во время обхода, пропускаются)"""
+        entries = []
+        for path in self.directory.glob('*/*.json'):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                pass
+        return entries
+
+    def _current_size(self) -> int:
+        """Суммарный размер записей (подсчитывается один раз, далее обновляется при записи)"""
+        if self._size is None:
+            self._size = sum(stat.st_size for _, stat in self._entries())
+        return self._size
+
+    def _evict(self) -> None:
+        """
+        Удалить давно не использованные записи, пока размер не станет меньше 90% лимита
+        """
+        entries = sorted(self._entries(), key=lambda e: e[1].st_mtime)
+        size = sum(stat.st_size for _, stat in entries)
+        target = self.max_size * 0.9
+
+        for path, stat in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass  # Уже удалена другим процессом
+            except OSError:
+                continue
+            size -= stat.st_size
+
+        self._size = size
@@ -1,20 +1,25 @@
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 from typing import List
 
 
-class ChangeOnRequestRule(WCAGRule):
+class ChangeOnRequestRule(ElementRule):
     name = "Change on Request"
     criterion = "3.2.5"
     level = "AAA"
+    version = "1"
+    tags = frozenset({"video", "audio", "meta", "form"})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._refreshes: List[Issue] = []
+        self._forms: List[Issue] = []
+
+    def visit(self, elem, html: str) -> List[Issue]:
         """
         Проверить отсутствие автоматических изменений контента
         """
         issues = []
-        soup = self._parse(html)
 
-        for elem in soup.find_all(["video", "audio"]):
+        if elem.name in ("video", "audio"):
             if elem.has_attr("autoplay"):
                 issues.append(self._issue(
                     elem,
@@ -23,22 +28,27 @@ class ChangeOnRequestRule(WCAGRule):
                     html
                 ))
 
-        for meta in soup.find_all("meta", attrs={"http-equiv": True}):
-            if meta.get("http-equiv").lower() == "refresh":
-                issues.append(self._issue(
-                    meta,
+        elif elem.name == "meta":
+            if elem.has_attr("http-equiv") and elem.get("http-equiv").lower() == "refresh":
+                self._refreshes.append(self._issue(
+                    elem,
                     "Страница автоматически обновляется через meta refresh",
                     "Удалите meta refresh, обеспечив обновление по запросу",
                     html
                 ))
 
-        for form in soup.find_all("form"):
-            if form.has_attr("onchange"):
-                issues.append(self._issue(
-                    form,
-                    "Форма отправляется автоматически при изменении",
-                    "Переведите отправку формы на явное действие пользователя",
-                    html
-                ))
+        elif elem.has_attr("onchange"):
+            self._forms.append(self._issue(
+                elem,
+                "Форма отправляется автоматически при изменении",
+                "Переведите отправку формы на явное действие пользователя",
+                html
+            ))
 
         return issues
+
+    def finalize(self, html: str) -> List[Issue]:
+        """
+        Вернуть нарушения meta refresh и форм (после нарушений медиа)
+        """
+        return self._refreshes + self._forms
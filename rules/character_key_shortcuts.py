@@ -1,11 +1,14 @@
 import re
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
-class CharacterKeyShortcutsRule(WCAGRule):
+class CharacterKeyShortcutsRule(ElementRule):
     name: str = "Character Key Shortcuts"
     criterion: str = "2.1.4"
     level: str = "A"
+    version: str = "1"
+    key_event_attrs = ['onkeydown', 'onkeypress', 'onkeyup']
+    attributes = frozenset(key_event_attrs)
 
     def _has_single_character_shortcut(self, script: str) -> bool:
         """
@@ -15,23 +18,20 @@ class CharacterKeyShortcutsRule(WCAGRule):
 
         return any(len(s.strip()) == 1 for s in re.findall(r"['\"]([a-z0-9])['\"]", script_lower))
 
-    def check(self, html: str) -> List[Issue]:
+    def visit(self, element, html: str) -> List[Issue]:
         """
         Проверяет HTML на наличие сочетаний клавиш с одиночными символами без возможности их управления.
         """
         issues: List[Issue] = []
-        soup = self._parse(html)
-        key_event_attrs = ['onkeydown', 'onkeypress', 'onkeyup']
-      
-        for element in soup.find_all(True):
-            for attr in key_event_attrs:
-                if element.has_attr(attr):
-                    script = element[attr]
-                    if self._has_single_character_shortcut(script):
-                        issues.append(self._issue(
-                            element,
-                            f"Используется сочетание клавиш на символы через {attr} без управления",
-                            "Обеспечьте возможность отключения, изменения или обхода таких сочетаний клавиш",
-                            html
-                        ))
+
+        for attr in self.key_event_attrs:
+            if element.has_attr(attr):
+                script = element[attr]
+                if self._has_single_character_shortcut(script):
+                    issues.append(self._issue(
+                        element,
+                        f"Используется сочетание клавиш на символы через {attr} без управления",
+                        "Обеспечьте возможность отключения, изменения или обхода таких сочетаний клавиш",
+                        html
+                    ))
         return issues
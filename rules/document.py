@@ -0,0 +1,135 @@
+from bisect import bisect_right
+from functools import cached_property
+from typing import List, Optional
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+# Доступные парсеры: встроенный html.parser и lxml (C-парсер, быстрее на больших страницах)
+PARSERS = ('html.parser', 'lxml')
+
+# libxml2 не хранит номера строк больше этого значения
+_LXML_MAX_LINE = 65535
+
+
+class Document:
+    """
+    Страница, разобранная один раз и общая для всех правил
+
+    Дерево и производные данные (HTML в нижнем регистре и т.п.) вычисляются лениво
+    при первом обращении и затем переиспользуются. Правила не должны изменять дерево
+    """
+
+    def __init__(self, html: str, parser: str = 'html.parser'):
+        """
+        :param html: HTML-контент страницы
+        :param parser: парсер для построения дерева ('html.parser' или 'lxml')
+        """
+        if parser not in PARSERS:
+            raise ValueError(f"Неподдерживаемый парсер: {parser}. Доступны: {', '.join(PARSERS)}")
+
+        self.html = html
+        self.parser = parser
+        self._source_lines_restored = False
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """
+        Дерево BeautifulSoup, построенное один раз на страницу
+
+        Для lxml номера строк элементов (sourceline) не заполняются, так как
+        BeautifulSoup сохраняет их только для html.parser; см. restore_source_lines()
+        """
+        return BeautifulSoup(self.html, self.parser)
+
+    @cached_property
+    def tree(self) -> Optional[etree._Element]:
+        """
+        Дерево lxml.html с собственными номерами строк (для правил, работающих с lxml напрямую)
+
+        :return: корневой элемент или None, если страница пустая
+        """
+        try:
+            return lxml.html.document_fromstring(self.html)
+        except (etree.ParserError, ValueError):
+            return None
+
+    @cached_property
+    def line_index(self) -> "LineIndex":
+        """
+        Индекс начала строк для перевода позиции в тексте в номер строки
+        """
+        return LineIndex(self.html)
+
+    @cached_property
+    def html_lower(self) -> str:
+        """
+        HTML-контент в нижнем регистре (для поиска строк без учёта регистра)
+        """
+        return self.html.lower()
+
+    def restore_source_lines(self) -> bool:
+        """
+        Перенести в дерево soup номера строк из дерева lxml.html (только для lxml)
+
+        Второе дерево строится при первом запросе номера строки, а не при разборе,
+        поэтому страницы без нарушений разбираются один раз
+
+        :return: True, если номера строк перенесены этим вызовом
+        """
+        if self.parser != 'lxml' or self._source_lines_restored:
+            return False
+        self._source_lines_restored = True
+        self._copy_source_lines(self.soup)
+        return True
+
+    def _copy_source_lines(self, soup: BeautifulSoup) -> None:
+        """
+        Перенести номера строк из дерева lxml.html в дерево BeautifulSoup
+
+        Оба дерева строит libxml2, поэтому элементы идут в одном порядке; сопоставление
+        прекращается на первом расхождении, остальные строки определит _get_line
+        """
+        if self.tree is None:
+            return
+
+        elements = (e for e in self.tree.iter() if isinstance(e.tag, str))
+        for tag, element in zip(soup.find_all(True), elements):
+            if tag.name != element.tag:
+                break
+            line = element.sourceline
+            if line and line < _LXML_MAX_LINE:
+                tag.sourceline = line
+
+    def __str__(self) -> str:
+        return self.html
+
+
+class LineIndex:
+    """
+    Позиции начала строк текста для быстрого перевода смещения в номер строки
+    """
+
+    def __init__(self, text: str):
+        """
+        :param text: исходный текст
+        """
+        starts: List[int] = [0]
+        pos = text.find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find('\n', pos + 1)
+        self._starts = starts
+
+    def line(self, pos: int) -> int:
+        """
+        Номер строки (с 1), в которой находится символ с заданным смещением
+        """
+        return bisect_right(self._starts, pos)
+
+    def offset(self, line: int) -> int:
+        """
+        Смещение начала строки с заданным номером (с 1)
+        """
+        line = min(max(line, 1), len(self._starts))
+        return self._starts[line - 1]
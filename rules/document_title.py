@@ -1,19 +1,28 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class DocumentTitleRule(WCAGRule):
+class DocumentTitleRule(ElementRule):
     name = "Page Titled"
     criterion = "2.4.2"
     level = "A"
+    version = "1"
+    tags = frozenset({'title'})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._title_tag = None
+
+    def visit(self, title_tag, html: str) -> List[Issue]:
+        if self._title_tag is None:
+            self._title_tag = title_tag
+        return []
+
+    def finalize(self, html: str) -> List[Issue]:
         """
         Проверить наличие и содержимое тега <title>
         """
         issues = []
-        soup = self._parse(html)
-        title_tag = soup.find('title')
+        title_tag = self._title_tag
 
         if not title_tag:
             issues.append(Issue(
@@ -36,4 +45,4 @@ class DocumentTitleRule(WCAGRule):
                     html
                 ))
 
-        return issues
\ No newline at end of file
+        return issues
@@ -1,28 +1,28 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class FocusVisibleRule(WCAGRule):
+class FocusVisibleRule(ElementRule):
     name = "Focus Visible"
     criterion = "2.4.7"
     level = "AA"
+    version = "1"
+    attributes = frozenset({'style'})
 
-    def check(self, html: str) -> List[Issue]:
+    def visit(self, elem, html: str) -> List[Issue]:
         """
         Проверяет отключение видимого фокуса
         """
         issues = []
-        soup = self._parse(html)
 
-        for elem in soup.find_all(style=True):
-            style = elem['style'].replace(" ", "").lower()
+        style = elem['style'].replace(" ", "").lower()
 
-            if "outline:none" in style or "outline:0" in style:
-                issues.append(self._issue(
-                    elem,
-                    "Элемент отключает видимый фокус (outline:none)",
-                    "Не скрывайте outline без предоставления альтернативного видимого фокуса",
-                    html
-                ))
+        if "outline:none" in style or "outline:0" in style:
+            issues.append(self._issue(
+                elem,
+                "Элемент отключает видимый фокус (outline:none)",
+                "Не скрывайте outline без предоставления альтернативного видимого фокуса",
+                html
+            ))
 
-        return issues
\ No newline at end of file
+        return issues
@@ -1,24 +1,33 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class HeadingsHierarchyRule(WCAGRule):
+class HeadingsHierarchyRule(ElementRule):
     name = "Info and Relationships"
     criterion = "1.3.1"
     level = "A"
+    version = "1"
+    tags = frozenset({'h1', 'h2', 'h3', 'h4', 'h5', 'h6'})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._headings = []
+
+    def visit(self, heading, html: str) -> List[Issue]:
+        self._headings.append(heading)
+        return []
+
+    def finalize(self, html: str) -> List[Issue]:
         """
         Проверить правильность иерархии заголовков (h1-h6)
         """
         issues = []
-        soup = self._parse(html)
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        headings = self._headings
 
         if not headings:
             return issues
 
-        h1_count = len([h for h in headings if h.name == 'h1'])
+        h1_tags = [h for h in headings if h.name == 'h1']
+        h1_count = len(h1_tags)
         if h1_count == 0:
             issues.append(Issue(
                 name=self.name,
@@ -30,7 +39,7 @@ class HeadingsHierarchyRule(WCAGRule):
                 recommendation='Добавьте единственный заголовок h1 с основной темой страницы'
             ))
         elif h1_count > 1:
-            for h1 in soup.find_all('h1')[1:]:
+            for h1 in h1_tags[1:]:
                 issues.append(self._issue(
                     h1,
                     f'На странице несколько заголовков h1 (найдено {h1_count})',
@@ -1,19 +1,28 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class HtmlLangRule(WCAGRule):
+class HtmlLangRule(ElementRule):
     name = "Language of Page"
     criterion = "3.1.1"
     level = "A"
+    version = "1"
+    tags = frozenset({'html'})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._html_tag = None
+
+    def visit(self, html_tag, html: str) -> List[Issue]:
+        if self._html_tag is None:
+            self._html_tag = html_tag
+        return []
+
+    def finalize(self, html: str) -> List[Issue]:
         """
         Проверить наличие атрибута lang у тега <html>
         """
         issues = []
-        soup = self._parse(html)
-        html_tag = soup.find('html')
+        html_tag = self._html_tag
 
         if not html_tag:
             issues.append(Issue(
@@ -40,4 +49,4 @@ class HtmlLangRule(WCAGRule):
                 html
             ))
 
-        return issues
\ No newline at end of file
+        return issues
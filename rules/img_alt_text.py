@@ -1,33 +1,33 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class ImageAltTextRule(WCAGRule):
+class ImageAltTextRule(ElementRule):
     name = "Non-text Content"
     criterion = "1.1.1"
     level = "A"
+    version = "1"
+    tags = frozenset({'img'})
 
-    def check(self, html: str) -> List[Issue]:
+    def visit(self, img, html: str) -> List[Issue]:
         """
         Проверить наличие атрибута alt у всех изображений
         """
         issues = []
-        soup = self._parse(html)
 
-        for img in soup.find_all('img'):
-            if not img.has_attr('alt'):
-                issues.append(self._issue(
-                    img,
-                    "Изображение не имеет атрибута alt",
-                    "Добавьте атрибут alt с описательным текстом или пустой alt=\"\" для декоративных изображений",
-                    html
-                ))
-            elif img.get('alt', '').lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.bmp')):
-                issues.append(self._issue(
-                    img,
-                    f"Атрибут alt содержит имя файла: '{img.get('alt')}'",
-                    "Замените имя файла на осмысленное описание содержимого изображения",
-                    html
-                ))
+        if not img.has_attr('alt'):
+            issues.append(self._issue(
+                img,
+                "Изображение не имеет атрибута alt",
+                "Добавьте атрибут alt с описательным текстом или пустой alt=\"\" для декоративных изображений",
+                html
+            ))
+        elif img.get('alt', '').lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.bmp')):
+            issues.append(self._issue(
+                img,
+                f"Атрибут alt содержит имя файла: '{img.get('alt')}'",
+                "Замените имя файла на осмысленное описание содержимого изображения",
+                html
+            ))
 
-        return issues
\ No newline at end of file
+        return issues
@@ -1,35 +1,35 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class KeyboardFocusOrderRule(WCAGRule):
+class KeyboardFocusOrderRule(ElementRule):
     name = "Focus Order"
     criterion = "2.4.3"
     level = "A"
+    version = "1"
+    attributes = frozenset({'tabindex'})
 
-    def check(self, html: str) -> List[Issue]:
+    def visit(self, element, html: str) -> List[Issue]:
         """
         Проверяет, что порядок фокуса логичен
         """
         issues = []
-        soup = self._parse(html)
 
-        for element in soup.select('[tabindex]'):
-            try:
-                tabindex_value = int(element.get('tabindex'))
-                if tabindex_value > 0:
-                    issues.append(self._issue(
-                        element,
-                        f'Элемент имеет положительный tabindex={tabindex_value}',
-                        'Использование tabindex > 0 может нарушить логический порядок фокуса. Оставьте tabindex="0" или удалите атрибут',
-                        html
-                    ))
-            except (ValueError, TypeError):
+        try:
+            tabindex_value = int(element.get('tabindex'))
+            if tabindex_value > 0:
                 issues.append(self._issue(
                     element,
-                    'Некорректное значение tabindex',
-                    'Используйте числовое значение tabindex',
+                    f'Элемент имеет положительный tabindex={tabindex_value}',
+                    'Использование tabindex > 0 может нарушить логический порядок фокуса. Оставьте tabindex="0" или удалите атрибут',
                     html
                 ))
+        except (ValueError, TypeError):
+            issues.append(self._issue(
+                element,
+                'Некорректное значение tabindex',
+                'Используйте числовое значение tabindex',
+                html
+            ))
 
-        return issues
\ No newline at end of file
+        return issues
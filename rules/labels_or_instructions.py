@@ -1,17 +1,20 @@
-from typing import List
-from .base import WCAGRule, Issue
+from typing import List, Set
+from .base import ElementRule, Issue
 
-class LabelsOrInstructionsRule(WCAGRule):
+class LabelsOrInstructionsRule(ElementRule):
     name: str = "Labels or Instructions"
     criterion: str = "3.3.2"
     level: str = "A"
+    version: str = "1"
+    form_elements = ['input', 'select', 'textarea']
+    tags = frozenset(form_elements + ['label'])
 
-    def _has_label(self, element, soup) -> bool:
+    def _has_label(self, element, label_targets: Set[str]) -> bool:
         """Проверить, имеет ли поле ввода связанную метку"""
         element_id = element.get('id')
 
         if element_id:
-            if soup.find('label', attrs={'for': element_id}):
+            if element_id in label_targets:
                 return True
 
         parent = element.parent
@@ -29,17 +32,26 @@ class LabelsOrInstructionsRule(WCAGRule):
 
         return False
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._label_targets: Set[str] = set()
+        self._fields = []
+
+    def visit(self, element, html: str) -> List[Issue]:
+        if element.name == 'label':
+            if element.has_attr('for'):
+                self._label_targets.add(element['for'])
+        else:
+            self._fields.append(element)
+        return []
+
+    def finalize(self, html: str) -> List[Issue]:
         """
         Проверяет поля формы на наличие меток или инструкций.
         """
         issues: List[Issue] = []
-        soup = self._parse(html)
-
-        form_elements = ['input', 'select', 'textarea']
 
-        for element in soup.find_all(form_elements):
-            if not self._has_label(element, soup):
+        for element in self._fields:
+            if not self._has_label(element, self._label_targets):
                 issues.append(self._issue(
                     element,
                     "Отсутствует метка или инструкция для поля ввода",
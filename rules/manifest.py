@@ -0,0 +1,127 @@
+import importlib
+from dataclasses import dataclass
+from typing import List, Optional, Iterable, Set
+
+# Уровни WCAG
+LEVELS = ('A', 'AA', 'AAA')
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """
+    Описание правила в манифесте: позволяет отобрать правила без импорта их модулей
+    """
+    module: str  # Имя модуля в пакете rules
+    class_name: str  # Имя класса правила
+    criterion: str  # Критерий WCAG
+    level: str  # Уровень WCAG
+
+
+# Статический список всех встроенных правил (порядок определяет порядок проверки)
+RULE_MANIFEST: List[RuleSpec] = [
+    RuleSpec('audio_control', 'AudioControlRule', '1.4.2', 'A'),
+    RuleSpec('autocomplete', 'InputPurposeRule', '1.3.5', 'AA'),
+    RuleSpec('button_accessibility', 'ButtonAccessibilityRule', '4.1.2', 'AA'),
+    RuleSpec('change_on_request', 'ChangeOnRequestRule', '3.2.5', 'AAA'),
+    RuleSpec('character_key_shortcuts', 'CharacterKeyShortcutsRule', '2.1.4', 'A'),
+    RuleSpec('document_title', 'DocumentTitleRule', '2.4.2', 'A'),
+    RuleSpec('focus_visible', 'FocusVisibleRule', '2.4.7', 'AA'),
+    RuleSpec('headings_hierarchy', 'HeadingsHierarchyRule', '1.3.1', 'A'),
+    RuleSpec('html_lang', 'HtmlLangRule', '3.1.1', 'A'),
+    RuleSpec('img_alt_text', 'ImageAltTextRule', '1.1.1', 'A'),
+    RuleSpec('keyboard_focus_order', 'KeyboardFocusOrderRule', '2.4.3', 'A'),
+    RuleSpec('labels_or_instructions', 'LabelsOrInstructionsRule', '3.3.2', 'A'),
+    RuleSpec('link_accessibility', 'LinkAccessibilityRule', '2.4.4', 'A'),
+    RuleSpec('motion_actuation', 'MotionActuationRule', '2.5.4', 'A'),
+    RuleSpec('multiple_ways', 'MultipleWaysRule', '2.4.5', 'AA'),
+    RuleSpec('on_input', 'OnInputRule', '3.2.2', 'A'),
+    RuleSpec('orientation', 'OrientationRule', '1.3.4', 'AA'),
+    RuleSpec('reflow', 'ReflowRule', '1.4.10', 'AA'),
+    RuleSpec('resize_text', 'ResizeTextRule', '1.4.4', 'AA'),
+    RuleSpec('section_headings', 'SectionHeadingsRule', '2.4.10', 'AAA'),
+    RuleSpec('status_messages', 'StatusMessagesRule', '4.1.3', 'AA'),
+]
+
+
+def rule_matches(module: str, class_name: str, criterion: str, level: str,
+                 levels: Optional[Iterable[str]] = None,
+                 criteria: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None) -> bool:
+    """
+    Проверить, проходит ли правило фильтры
+
+    :param module: имя модуля правила
+    :param class_name: имя класса правила
+    :param criterion: критерий WCAG правила
+    :param level: уровень WCAG правила
+    :param levels: допустимые уровни (None - любые)
+    :param criteria: допустимые критерии (None - любые)
+    :param exclude: исключённые правила (имя модуля или класса, без учёта регистра)
+    :return: True, если правило нужно выполнять
+    """
+    if levels is not None and level not in levels:
+        return False
+    if criteria is not None and criterion not in criteria:
+        return False
+    if exclude is not None:
+        excluded = {e.lower() for e in exclude}
+        if module.lower() in excluded or class_name.lower() in excluded:
+            return False
+    return True
+
+
+def rule_names() -> Set[str]:
+    """
+    Имена правил манифеста (модули и классы) в нижнем регистре
+
+    :return: имена, по которым можно исключать правила
+    """
+    return {name.lower() for spec in RULE_MANIFEST for name in (spec.module, spec.class_name)}
+
+
+def select_specs(levels: Optional[Iterable[str]] = None,
+                 criteria: Optional[Iterable[str]] = None,
+                 exclude: Optional[Iterable[str]] = None,
+                 extra_criteria: Iterable[str] = ()) -> List[RuleSpec]:
+    """
+    Отобрать правила манифеста по уровню, критерию и имени
+
+    :param levels: допустимые уровни (None - любые)
+    :param criteria: допустимые критерии (None - любые)
+    :param exclude: исключённые правила (имя модуля или класса)
+    :param extra_criteria: критерии правил вне манифеста, которые тоже считаются известными
+    :return: описания отобранных правил
+    :raises ValueError: при неизвестном уровне или критерии
+    """
+    if levels is not None:
+        levels = set(levels)
+        unknown = levels - set(LEVELS)
+        if unknown:
+            raise ValueError(f"Неизвестный уровень WCAG: {', '.join(sorted(unknown))}. Доступны: {', '.join(LEVELS)}")
+    if criteria is not None:
+        criteria = set(criteria)
+        unknown = criteria - {spec.criterion for spec in RULE_MANIFEST} - set(extra_criteria)
+        if unknown:
+            raise ValueError(f"Нет правил для критериев WCAG: {', '.join(sorted(unknown))}")
+
+    return [
+        spec for spec in RULE_MANIFEST
+        if rule_matches(spec.module, spec.class_name, spec.criterion, spec.level, levels, criteria, exclude)
+    ]
+
+
+def load_rules(specs: Optional[Iterable[RuleSpec]] = None) -> list:
+    """
+    Импортировать модули указанных правил (и только их)
+
+    :param specs: описания правил (по умолчанию весь манифест)
+    :return: классы правил в порядке манифеста
+    """
+    rules = []
+    for spec in RULE_MANIFEST if specs is None else specs:
+        try:
+            module = importlib.import_module(f"rules.{spec.module}")
+            rules.append(getattr(module, spec.class_name))
+        except Exception as e:
+            print(f"Предупреждение: не удалось загрузить правило {spec.module}: {e}")
+    return rules
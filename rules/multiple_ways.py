@@ -1,32 +1,47 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class MultipleWaysRule(WCAGRule):
+class MultipleWaysRule(ElementRule):
     name = "Multiple Ways"
     criterion = "2.4.5"
     level = "AA"
+    version = "1"
+    tags = frozenset({'input', 'form', 'nav', 'ul', 'ol', 'a'})
+    attributes = frozenset({'role'})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._has_search = False
+        self._total_nav_links = 0
+        self._has_sitemap = False
+
+    def visit(self, elem, html: str) -> List[Issue]:
+        classes = ' '.join(elem.get('class', [])).lower()
+
+        if elem.get('role') == 'search':
+            self._has_search = True
+        elif elem.name == 'input' and elem.get('type') == 'search':
+            self._has_search = True
+        elif elem.name == 'form' and 'search' in classes:
+            self._has_search = True
+
+        if elem.name == 'nav':
+            self._total_nav_links += 1
+        elif elem.name in ('ul', 'ol') and 'nav' in classes:
+            self._total_nav_links += 1
+
+        if elem.name == 'a' and 'sitemap' in elem.get('href', '').lower():
+            self._has_sitemap = True
+
+        return []
+
+    def finalize(self, html: str) -> List[Issue]:
         """
         Проверить наличие нескольких способов навигации (поиск, навигация, карта сайта)
         """
         issues = []
-        soup = self._parse(html)
-
-        has_search = bool(
-            soup.find(attrs={'role': 'search'}) or
-            soup.find('input', attrs={'type': 'search'}) or
-            soup.find('form', class_=lambda c: c and 'search' in str(c).lower())
-        )
-
-        nav_links = soup.find_all('nav')
-        list_navs = soup.find_all(['ul', 'ol'], class_=lambda c: c and 'nav' in str(c).lower())
-        total_nav_links = len(nav_links) + len(list_navs)
-
-        has_sitemap = bool(soup.find('a', href=lambda h: h and 'sitemap' in h.lower()))
 
-        if not has_search and total_nav_links == 0 and not has_sitemap:
+        if not self._has_search and self._total_nav_links == 0 and not self._has_sitemap:
             issues.append(Issue(
                 name=self.name,
                 criterion=self.criterion,
@@ -37,4 +52,4 @@ class MultipleWaysRule(WCAGRule):
                 recommendation='Добавьте поиск, навигационное меню или ссылку на карту сайта'
             ))
 
-        return issues
\ No newline at end of file
+        return issues
@@ -1,20 +1,29 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class OrientationRule(WCAGRule):
+class OrientationRule(ElementRule):
     name = "Orientation"
     criterion = "1.3.4"
     level = "AA"
+    version = "1"
+    tags = frozenset({'meta'})
 
-    def check(self, html: str) -> List[Issue]:
+    def begin(self) -> None:
+        self._viewport = None
+
+    def visit(self, meta, html: str) -> List[Issue]:
+        if self._viewport is None and meta.get('name') == 'viewport':
+            self._viewport = meta
+        return []
+
+    def finalize(self, html: str) -> List[Issue]:
         """
         Проверить отсутствие ограничения ориентации экрана
         """
         issues = []
-        soup = self._parse(html)
 
-        viewport = soup.find('meta', attrs={'name': 'viewport'})
+        viewport = self._viewport
         if viewport and viewport.get('content'):
             content = viewport['content'].lower()
             if 'width' in content and 'height' not in content and 'orientation' not in content:
@@ -25,4 +34,4 @@ class OrientationRule(WCAGRule):
                         'Убедитесь, что контент доступен как в портретной, так и в ландшафтной ориентации. Используйте content="width=device-width, initial-scale=1" без жёстких значений',
                         html
                     ))
-        return issues
\ No newline at end of file
+        return issues
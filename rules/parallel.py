@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .base import WCAGRule, Issue, RuleError
+from .document import Document
+from profiling import Profiler, StageRecord
+
+# Документ, переданный процессу-исполнителю при запуске (один раз на процесс)
+_document: Optional[Document] = None
+
+
+def _init_worker(html: str, parser: str) -> None:
+    """
+    Инициализировать процесс-исполнитель: сохранить страницу для всех его задач
+
+    :param html: HTML-контент страницы
+    :param parser: парсер для построения дерева
+    """
+    global _document
+    _document = Document(html, parser)
+
+
+def _check_group(rules: List[type[WCAGRule]], single_pass: bool, profile: bool,
+                 collect_errors: bool) -> Tuple[List[Optional[List[Issue]]], List[StageRecord], List[RuleError]]:
+    """
+    Выполнить группу правил над документом процесса-исполнителя
+
+    :param rules: классы правил группы
+    :param single_pass: использовать общий обход дерева для ElementRule
+    :param profile: собирать замеры времени
+    :param collect_errors: возвращать ошибки правил (иначе они выводятся процессом)
+    :return: нарушения каждого правила группы, замеры и ошибки правил
+    """
+    profiler = Profiler() if profile else None
+    errors: Optional[List[RuleError]] = [] if collect_errors else None
+    results = WCAGRule.run_rules(_document, rules, single_pass, profiler, errors)
+    return results, profiler.records if profiler else [], errors or []
+
+
+def run_parallel(document: Document, rules: List[type[WCAGRule]], workers: int,
+                 single_pass: bool = True, profiler: Optional[Profiler] = None,
+                 errors: Optional[List[RuleError]] = None) -> List[Optional[List[Issue]]]:
+    """
+    Выполнить правила в пуле процессов
+
+    Правила делятся на группы по числу процессов; страница передаётся каждому
+    процессу один раз при запуске и разбирается в нём один раз. Результаты
+    собираются в исходном порядке правил, как при последовательной проверке
+
+    :param document: страница
+    :param rules: классы правил
+    :param workers: число процессов
+    :param single_pass: использовать общий обход дерева для ElementRule внутри группы
+    :param profiler: профилировщик (замеры процессов добавляются в него, без памяти)
+    :param errors: список, в который добавляются ошибки правил (без него ошибки выводятся)
+    :return: нарушения каждого правила в порядке rules (None при ошибке в правиле)
+    """
+    workers = max(1, min(workers, len(rules)))
+    groups = [rules[i::workers] for i in range(workers)]
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(document.html, document.parser)) as pool:
+        futures = [
+            pool.submit(_check_group, group, single_pass, profiler is not None, errors is not None)
+            for group in groups
+        ]
+        outcomes = [future.result() for future in futures]
+
+    results: List[Optional[List[Issue]]] = [None for _ in rules]
+    for offset, (group_results, records, group_errors) in enumerate(outcomes):
+        for position, issues in enumerate(group_results):
+            results[offset + position * workers] = issues
+        if profiler is not None:
+            profiler.records.extend(records)
+        if errors is not None:
+            errors.extend(group_errors)
+
+    return results
@@ -1,33 +1,31 @@
 from typing import List
-from .base import WCAGRule, Issue
+from .base import ElementRule, Issue
 
 
-class SectionHeadingsRule(WCAGRule):
+class SectionHeadingsRule(ElementRule):
     name = "Section Headings"
     criterion = "2.4.10"
     level = "AAA"
+    version = "1"
+    tags = frozenset({'article', 'section', 'aside', 'nav'})
 
-    def check(self, html: str) -> List[Issue]:
+    def visit(self, section, html: str) -> List[Issue]:
         """
         Проверить наличие заголовков в основных секциях страницы
         """
         issues = []
-        soup = self._parse(html)
 
-        semantic_sections = soup.find_all(['article', 'section', 'aside', 'nav'])
+        has_heading = section.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
 
-        for section in semantic_sections:
-            has_heading = section.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        has_aria_label = section.has_attr('aria-label') and section['aria-label'].strip()
+        has_aria_labelledby = section.has_attr('aria-labelledby')
 
-            has_aria_label = section.has_attr('aria-label') and section['aria-label'].strip()
-            has_aria_labelledby = section.has_attr('aria-labelledby')
-
-            if not has_heading and not has_aria_label and not has_aria_labelledby:
-                issues.append(self._issue(
-                    section,
-                    f'Секция <{section.name}> не содержит заголовка',
-                    'Добавьте заголовок (h1-h6) или aria-label для описания секции',
-                    html
-                ))
+        if not has_heading and not has_aria_label and not has_aria_labelledby:
+            issues.append(self._issue(
+                section,
+                f'Секция <{section.name}> не содержит заголовка',
+                'Добавьте заголовок (h1-h6) или aria-label для описания секции',
+                html
+            ))
 
         return issues